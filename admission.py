@@ -0,0 +1,215 @@
+"""
+Admission control for the parse endpoints.
+
+Requests are classified by cost and run in separate lanes:
+
+  text   /extract and .txt uploads of normal size (in-process, milliseconds)
+  doc    PDF/DOCX uploads of normal size (extractor pool, ~1s)
+  heavy  images (tesseract OCR), large .txt files, large or long PDFs/DOCX (seconds)
+
+Each lane has its own concurrency limit and a queue-wait budget. A request
+that would wait longer than the budget (estimated from the lane's recent
+service times) is shed right away with a retry hint instead of piling up,
+so an OCR burst fills the heavy lane and text requests never queue behind
+it. Clients can also get a token bucket (off by default); heavier lanes
+cost more tokens.
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, Optional
+
+TEXT_EXTENSIONS = {"txt"}
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg"}
+
+HEAVY_BYTES = 5 * 1024 * 1024
+# a .txt this big takes a parse of seconds, not milliseconds
+HEAVY_TEXT_BYTES = 1024 * 1024
+HEAVY_PDF_PAGES = 15
+
+# token cost per request in each lane (rate limiting)
+LANE_COSTS = {"text": 1.0, "doc": 2.0, "heavy": 5.0}
+
+DEFAULT_LANES = {
+    # concurrency, queue-wait budget (s), first guess of service time (s)
+    "text": {"concurrency": 16, "latency_budget": 2.0, "service_time": 0.05},
+    "doc": {"concurrency": 1, "latency_budget": 15.0, "service_time": 1.0},
+    "heavy": {"concurrency": 1, "latency_budget": 30.0, "service_time": 5.0},
+}
+
+_PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_SCAN_CHUNK = 1024 * 1024
+
+
+class Rejected(Exception):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class RateLimited(Rejected):
+    """The client is over its request rate (HTTP 429)."""
+
+
+class Overloaded(Rejected):
+    """The lane's queue is over its latency budget (HTTP 503)."""
+
+
+# -----------------------------
+# Classification
+# -----------------------------
+def pdf_page_count(stream: BinaryIO) -> int:
+    """
+    Counts /Type /Page objects without parsing the PDF; restores the position.
+    A lower bound: pages inside compressed object streams are not seen.
+    """
+    pos = stream.tell()
+    count, tail = 0, b""
+    try:
+        stream.seek(0)
+        while True:
+            chunk = stream.read(_SCAN_CHUNK)
+            if not chunk:
+                break
+            buf = tail + chunk
+            # markers starting in the last 32 bytes are counted with the next
+            # chunk, so one split across chunks is seen exactly once
+            cut = max(0, len(buf) - 32)
+            count += sum(1 for m in _PDF_PAGE_RE.finditer(buf) if m.start() < cut)
+            tail = buf[cut:]
+        count += len(_PDF_PAGE_RE.findall(tail))
+    finally:
+        stream.seek(pos)
+    return count
+
+
+def classify_file(extension: str, size: int, pages: Optional[int] = None) -> str:
+    ext = (extension or "").lower().lstrip(".")
+    if ext in TEXT_EXTENSIONS:
+        return "heavy" if size >= HEAVY_TEXT_BYTES else "text"
+    if ext in IMAGE_EXTENSIONS:
+        return "heavy"
+    if size >= HEAVY_BYTES or (pages or 0) > HEAVY_PDF_PAGES:
+        return "heavy"
+    return "doc"
+
+
+def classify_upload(stream: BinaryIO, extension: str) -> str:
+    """Lane for an uploaded file stream (size from seeking, pages for PDFs)."""
+    pos = stream.tell()
+    stream.seek(0, 2)
+    size = stream.tell()
+    stream.seek(pos)
+
+    ext = (extension or "").lower().lstrip(".")
+    pages = pdf_page_count(stream) if ext == "pdf" and size < HEAVY_BYTES else None
+    return classify_file(ext, size, pages)
+
+
+# -----------------------------
+# Lanes
+# -----------------------------
+class Lane:
+    def __init__(self, name: str, concurrency: int, latency_budget: float, service_time: float = 1.0):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.latency_budget = latency_budget
+        self.service_time = service_time  # EWMA of recent run times (s)
+
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self._cond = threading.Condition()
+
+    def _estimated_wait(self) -> float:
+        if self.running < self.concurrency:
+            return 0.0
+        # whole "rounds" of the lane ahead of this request
+        return (self.waiting // self.concurrency + 1) * self.service_time
+
+    def acquire(self) -> float:
+        """Returns the start time; raises Overloaded instead of queueing too long."""
+        with self._cond:
+            wait = self._estimated_wait()
+            if wait > self.latency_budget:
+                self.shed += 1
+                raise Overloaded(f"Server busy ({self.name} lane), please retry.", wait)
+
+            deadline = time.monotonic() + self.latency_budget
+            self.waiting += 1
+            try:
+                while self.running >= self.concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        raise Overloaded(f"Server busy ({self.name} lane), please retry.", self.service_time)
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+
+            self.running += 1
+            self.admitted += 1
+        return time.monotonic()
+
+    def release(self, started: float) -> None:
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self.running -= 1
+            self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+            self._cond.notify()
+
+
+class RateLimiter:
+    """Token bucket per client key; idle buckets are evicted past max_clients."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float = 1.0) -> float:
+        """0.0 if allowed, else the seconds until the client may retry."""
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / self.rate
+            self._buckets[key] = [tokens, now]
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionController:
+    def __init__(self, lanes: Dict[str, Dict], rate: float = 0.0, burst: float = 20.0):
+        self.lanes = {name: Lane(name, **cfg) for name, cfg in lanes.items()}
+        self.limiter = RateLimiter(rate, burst) if rate > 0 else None
+
+    @contextmanager
+    def admit(self, client: str, lane: str) -> Iterator[None]:
+        """Raises RateLimited / Overloaded, else runs the block inside the lane."""
+        if self.limiter is not None:
+            wait = self.limiter.take(client, LANE_COSTS.get(lane, 1.0))
+            if wait > 0:
+                raise RateLimited("Too many requests, please slow down.", wait)
+
+        target = self.lanes[lane]
+        started = target.acquire()
+        try:
+            yield
+        finally:
+            target.release(started)
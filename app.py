@@ -1,11 +1,26 @@
+import gzip
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
 from flask import Flask, request, jsonify
 from werkzeug.utils import secure_filename
 from flask_cors import CORS
 
 from utils import extract_text, clean_text
+from admission import DEFAULT_LANES, HEAVY_TEXT_BYTES, AdmissionController, Overloaded, RateLimited, classify_upload
+from extract_pool import ExtractorPool
+from incremental_parse import EditConflict, SessionStore
+from shadow import ShadowRunner
 import resume_nlp
 
+try:
+    import semantic_index  # needs numpy
+except ImportError:
+    semantic_index = None
+
 app = Flask(__name__)
 CORS(app)
 
@@ -13,6 +28,88 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Caps the work /extract does on huge pasted texts (set to None to disable).
+app.config["EXTRACT_BUDGET"] = resume_nlp.DEFAULT_BUDGET
+
+# Sandboxed PDF/DOCX/image extraction (see extract_pool.py).
+# DEET_EXTRACT_WORKERS=0 extracts in-process instead.
+app.config["EXTRACT_WORKERS"] = int(os.environ.get("DEET_EXTRACT_WORKERS", "2"))
+app.config["EXTRACT_TIMEOUT"] = float(os.environ.get("DEET_EXTRACT_TIMEOUT", "60"))
+app.config["EXTRACT_CPU_SECONDS"] = int(os.environ.get("DEET_EXTRACT_CPU_SECONDS", "30"))
+app.config["EXTRACT_MEMORY_MB"] = int(os.environ.get("DEET_EXTRACT_MEMORY_MB", "1024"))
+
+_extractor_pool = None
+_extractor_pool_lock = threading.Lock()
+
+# Admission control (see admission.py): text / doc / heavy (OCR, long PDFs)
+# lanes with their own concurrency limits, so OCR bursts cannot starve cheap
+# requests. doc + heavy together should not exceed EXTRACT_WORKERS.
+app.config["LANES"] = {
+    "text": dict(DEFAULT_LANES["text"], concurrency=int(os.environ.get("DEET_LANE_TEXT", "16"))),
+    "doc": dict(DEFAULT_LANES["doc"], concurrency=int(os.environ.get(
+        "DEET_LANE_DOC", str(max(1, app.config["EXTRACT_WORKERS"] - 1))))),
+    "heavy": dict(DEFAULT_LANES["heavy"], concurrency=int(os.environ.get("DEET_LANE_HEAVY", "1"))),
+}
+# Per-client token bucket (tokens/s, burst); text costs 1, doc 2, heavy 5. 0 = off
+# (the default: clients behind one NAT or proxy share an IP).
+app.config["RATE_LIMIT_PER_SEC"] = float(os.environ.get("DEET_RATE_LIMIT", "0"))
+app.config["RATE_LIMIT_BURST"] = float(os.environ.get("DEET_RATE_BURST", "20"))
+
+_admission = None
+_admission_lock = threading.Lock()
+
+# Semantic matching indexes (see semantic_index.py). The skills index is built
+# on first use if missing; the jobs index must be built from a job catalog.
+app.config["SKILL_INDEX_DIR"] = os.environ.get("DEET_SKILL_INDEX", os.path.join(BASE_DIR, "indexes", "skills"))
+app.config["JOB_INDEX_DIR"] = os.environ.get("DEET_JOB_INDEX", os.path.join(BASE_DIR, "indexes", "jobs"))
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+# Recent parse results for GET /profiles/<id> (small LRU, in-process only)
+PROFILE_CACHE_SIZE = 256
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+# Live-edit parse sessions for the register form (see incremental_parse.py)
+_sessions = SessionStore()
+
+# Shadow mode (see shadow.py): DEET_SHADOW_PARSER=/path/to/candidate.py runs a
+# sampled share of parses through a candidate resume_nlp after the response
+# is sent, and logs field diffs + latencies. Unset = off.
+app.config["SHADOW_PARSER"] = os.environ.get("DEET_SHADOW_PARSER", "")
+app.config["SHADOW_SAMPLE_RATE"] = float(os.environ.get("DEET_SHADOW_RATE", "0.05"))
+app.config["SHADOW_LOG"] = os.environ.get("DEET_SHADOW_LOG", os.path.join(BASE_DIR, "logs", "shadow.jsonl"))
+app.config["SHADOW_TIMEOUT"] = float(os.environ.get("DEET_SHADOW_TIMEOUT", "30"))
+
+_shadow = None
+_shadow_lock = threading.Lock()
+
+# JSON responses above this size are gzipped when the client accepts it
+GZIP_MIN_BYTES = 1024
+
+
+@app.after_request
+def compress_response(response):
+    accept = request.headers.get("Accept-Encoding", "")
+    if (
+        "gzip" not in accept.lower()
+        or response.direct_passthrough
+        or not 200 <= response.status_code < 300
+        or "Content-Encoding" in response.headers
+        or response.mimetype != "application/json"
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < GZIP_MIN_BYTES:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6, mtime=0))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
 
 @app.get("/")
 def health_check():
@@ -35,12 +132,148 @@ def read_txt_with_fallbacks(path: str) -> str:
     return raw.decode("utf-8", errors="ignore")
 
 
-def _call_resume_parser(text: str) -> dict:
+def _get_extractor_pool():
+    """Created lazily: spawned workers re-import this module, so never at import time."""
+    global _extractor_pool
+    if app.config["EXTRACT_WORKERS"] <= 0:
+        return None
+    with _extractor_pool_lock:
+        if _extractor_pool is None:
+            _extractor_pool = ExtractorPool(
+                workers=app.config["EXTRACT_WORKERS"],
+                timeout=app.config["EXTRACT_TIMEOUT"],
+                cpu_seconds=app.config["EXTRACT_CPU_SECONDS"],
+                memory_mb=app.config["EXTRACT_MEMORY_MB"],
+            )
+    return _extractor_pool
+
+
+def _get_admission():
+    global _admission
+    with _admission_lock:
+        if _admission is None:
+            _admission = AdmissionController(
+                app.config["LANES"],
+                rate=app.config["RATE_LIMIT_PER_SEC"],
+                burst=app.config["RATE_LIMIT_BURST"],
+            )
+        return _admission
+
+
+def _admitted(classify):
+    """
+    Runs the view in the lane classify() picks for the request. Rejections
+    return 429 (client over its rate) or 503 (lane over its latency budget),
+    both with Retry-After.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            try:
+                with _get_admission().admit(request.remote_addr or "unknown", classify()):
+                    return view(*args, **kwargs)
+            except (RateLimited, Overloaded) as e:
+                response = jsonify({"success": False, "data": None, "error": f"{e} Retry in {e.retry_after}s."})
+                response.status_code = 429 if isinstance(e, RateLimited) else 503
+                response.headers["Retry-After"] = str(e.retry_after)
+                return response
+        return wrapped
+    return decorator
+
+
+def _classify_upload() -> str:
+    uploaded_file = request.files.get("file")
+    if uploaded_file is None or not uploaded_file.filename:
+        return "text"  # rejected by the view right away
+    return classify_upload(uploaded_file.stream, os.path.splitext(uploaded_file.filename)[1])
+
+
+def _classify_extract() -> str:
+    # pasted text is parsed like a .txt upload of the same size
+    return "heavy" if (request.content_length or 0) >= HEAVY_TEXT_BYTES else "text"
+
+
+def _extract_file_text(filepath: str, extension: str):
+    """Returns (text, error_reason_or_None)."""
+    pool = _get_extractor_pool()
+    if pool is None:
+        return extract_text(filepath, extension), None
+
+    result = pool.extract(filepath, extension)
+    return result.text, result.error
+
+
+def _get_index(kind: str):
+    """Returns the opened VectorIndex for "skills"/"jobs", or None if unavailable."""
+    if semantic_index is None:
+        return None
+    with _indexes_lock:
+        if kind not in _indexes:
+            path = app.config["SKILL_INDEX_DIR" if kind == "skills" else "JOB_INDEX_DIR"]
+            if os.path.exists(os.path.join(path, "meta.json")):
+                _indexes[kind] = semantic_index.VectorIndex(path)
+            elif kind == "skills":
+                _indexes[kind] = semantic_index.build_skill_index(path)
+            else:
+                return None
+        return _indexes[kind]
+
+
+def _remember_profile(text: str, profile: dict) -> str:
+    """Caches a parse result; the id is a content hash, so it doubles as the ETag."""
+    profile_id = hashlib.sha256(text.encode("utf-8")).hexdigest()[:20]
+    with _profile_cache_lock:
+        _profile_cache[profile_id] = profile
+        _profile_cache.move_to_end(profile_id)
+        while len(_profile_cache) > PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile_id
+
+
+def _get_shadow():
+    """
+    The shadow runner, or None when shadow mode is off. A runner that cannot
+    be started (e.g. a wrong DEET_SHADOW_PARSER path) is logged once and
+    shadow mode is switched off; it never affects the response.
+    """
+    global _shadow
+    if not app.config["SHADOW_PARSER"] or app.config["SHADOW_SAMPLE_RATE"] <= 0:
+        return None
+    with _shadow_lock:
+        if _shadow is None and app.config["SHADOW_PARSER"]:
+            try:
+                _shadow = ShadowRunner(
+                    app.config["SHADOW_PARSER"],
+                    app.config["SHADOW_LOG"],
+                    sample_rate=app.config["SHADOW_SAMPLE_RATE"],
+                    timeout=app.config["SHADOW_TIMEOUT"],
+                )
+            except Exception as e:
+                app.logger.error("Shadow mode disabled: %s", e)
+                app.config["SHADOW_PARSER"] = ""
+        return _shadow
+
+
+def _shadow_after_response(response, text: str):
+    """Queues text for the shadow parser once the response has been sent."""
+    shadow = _get_shadow()
+    if shadow is not None:
+        budget = app.config["EXTRACT_BUDGET"]
+        response.call_on_close(lambda: shadow.submit(text, budget))
+    return response
+
+
+def _flag(name: str) -> bool:
+    return (request.args.get(name) or "").lower() in {"1", "true", "yes"}
+
+
+def _call_resume_parser(text: str, **kwargs) -> dict:
     """
     Call the resume parser from resume_nlp.py.
 
     ✅ Preferred: extract_profile(text)
     Falls back to other possible function names.
+    Extra kwargs (e.g. budget=...) are passed through.
     """
     candidates = [
         "extract_profile",        # ✅ your current resume_nlp.py uses this
@@ -53,7 +286,7 @@ def _call_resume_parser(text: str) -> dict:
     for fn_name in candidates:
         fn = getattr(resume_nlp, fn_name, None)
         if callable(fn):
-            return fn(text)
+            return fn(text, **kwargs)
 
     raise RuntimeError(
         "No parser function found in resume_nlp.py. Expected one of: "
@@ -62,7 +295,14 @@ def _call_resume_parser(text: str) -> dict:
 
 
 @app.post("/upload")
+@_admitted(_classify_upload)
 def upload_resume():
+    """
+    Default: returns {"raw_text"}.
+    ?parse=1 also runs extract_profile in the same request and returns
+    {"profile", "profile_id"} (plus "raw_text" only with &raw=1), which saves
+    the client the /upload -> /extract round trip.
+    """
     uploaded_file = request.files.get("file")
 
     if uploaded_file is None:
@@ -82,13 +322,21 @@ def upload_resume():
     uploaded_file.save(filepath)
 
     # ✅ FIX: handle TXT separately
+    extract_error = None
     if extension == "txt":
         raw_text = read_txt_with_fallbacks(filepath)
     else:
-        raw_text = extract_text(filepath, extension)
+        raw_text, extract_error = _extract_file_text(filepath, extension)
 
     cleaned_text = clean_text(raw_text)
 
+    if extract_error:
+        return jsonify({
+            "success": False,
+            "data": None,
+            "error": f"Could not extract text from uploaded file: {extract_error}"
+        }), 422
+
     if not cleaned_text or not cleaned_text.strip():
         return jsonify({
             "success": False,
@@ -96,11 +344,40 @@ def upload_resume():
             "error": "Could not extract text from uploaded file. The format may be unsupported or the file may be empty."
         }), 422
 
-    # ✅ return raw text
-    return jsonify({"success": True, "data": {"raw_text": cleaned_text}, "error": None})
+    if not _flag("parse"):
+        # ✅ return raw text
+        return jsonify({"success": True, "data": {"raw_text": cleaned_text}, "error": None})
+
+    try:
+        parsed = _call_resume_parser(cleaned_text, budget=app.config["EXTRACT_BUDGET"])
+    except Exception as e:
+        return jsonify({"success": False, "data": None, "error": f"Parser error: {str(e)}"}), 500
+
+    data = {"profile": parsed, "profile_id": _remember_profile(cleaned_text, parsed)}
+    if _flag("raw"):
+        data["raw_text"] = cleaned_text
+    return _shadow_after_response(jsonify({"success": True, "data": data, "error": None}), cleaned_text)
+
+
+@app.get("/profiles/<profile_id>")
+def get_profile(profile_id: str):
+    """Re-fetch a recent parse result; supports If-None-Match -> 304."""
+    with _profile_cache_lock:
+        profile = _profile_cache.get(profile_id)
+
+    if profile is None:
+        return jsonify({"success": False, "data": None, "error": "Profile not found or expired."}), 404
+
+    response = jsonify({"success": True, "data": {"profile": profile, "profile_id": profile_id}, "error": None})
+    # weak: the same profile may be sent gzipped or not (compress_response)
+    response.set_etag(profile_id, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True  # always revalidate; 304 is cheap
+    return response.make_conditional(request)
 
 
 @app.post("/extract")
+@_admitted(_classify_extract)
 def extract_structured():
     payload = request.get_json(silent=True) or {}
     text = (payload.get("text") or "").strip()
@@ -109,15 +386,139 @@ def extract_structured():
         return jsonify({"success": False, "data": None, "error": "Missing 'text' in request body"}), 400
 
     try:
-        parsed = _call_resume_parser(text)
+        parsed = _call_resume_parser(text, budget=app.config["EXTRACT_BUDGET"])
 
         # ✅ Normalize: ALWAYS return {success,data,error}
-        return jsonify({"success": True, "data": parsed, "error": None})
+        return _shadow_after_response(jsonify({"success": True, "data": parsed, "error": None}), text)
 
     except Exception as e:
         return jsonify({"success": False, "data": None, "error": f"Parser error: {str(e)}"}), 500
 
 
+@app.get("/skills/similar")
+def similar_skills():
+    query = (request.args.get("q") or "").strip()
+    k = max(1, request.args.get("k", 10, type=int))
+
+    if not query:
+        return jsonify({"success": False, "data": None, "error": "Missing 'q' query parameter"}), 400
+
+    index = _get_index("skills")
+    if index is None:
+        return jsonify({"success": False, "data": None, "error": "Semantic matching unavailable (numpy not installed)."}), 503
+
+    matches = [{"skill": skill, "score": score} for skill, score in semantic_index.similar_skills(index, query, k)]
+    return jsonify({"success": True, "data": {"query": query, "matches": matches}, "error": None})
+
+
+@app.post("/jobs/similar")
+def similar_jobs():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    profile = payload.get("profile")
+
+    if not isinstance(profile, dict):
+        return jsonify({"success": False, "data": None, "error": "Missing 'profile' in request body"}), 400
+
+    try:
+        k = payload.get("k")
+        k = 10 if k is None else max(1, int(k))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "data": None, "error": "'k' must be an integer"}), 400
+
+    index = _get_index("jobs")
+    if index is None:
+        return jsonify({
+            "success": False,
+            "data": None,
+            "error": "Job index not built. Run: python semantic_index.py build-jobs indexes/jobs jobs.jsonl"
+        }), 503
+
+    matches = [{"job": job, "score": score} for job, score in semantic_index.similar_jobs(index, profile, k)]
+    return jsonify({"success": True, "data": {"matches": matches}, "error": None})
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _edits_error(payload):
+    """Why an edit body is malformed (checked before touching the session), or None."""
+    edits = payload.get("edits")
+    if not isinstance(edits, list):
+        return "Missing 'edits' in request body"
+    if payload.get("version") is not None and not _is_int(payload["version"]):
+        return "'version' must be an integer"
+    for i, edit in enumerate(edits):
+        if not isinstance(edit, dict):
+            return f"edits[{i}] must be an object"
+        for key in ("start", "end"):
+            if edit.get(key) is not None and not _is_int(edit[key]):
+                return f"edits[{i}].{key} must be an integer"
+        if edit.get("text") is not None and not isinstance(edit["text"], str):
+            return f"edits[{i}].text must be a string"
+    return None
+
+
+@app.post("/sessions")
+def create_session():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    text = payload.get("text")
+
+    if text is not None and not isinstance(text, str):
+        return jsonify({"success": False, "data": None, "error": "'text' must be a string"}), 400
+    if not (text or "").strip():
+        return jsonify({"success": False, "data": None, "error": "Missing 'text' in request body"}), 400
+
+    session = _sessions.create(text, budget=app.config["EXTRACT_BUDGET"])
+    return jsonify({
+        "success": True,
+        "data": {"session_id": session.id, "version": session.version, "profile": session.profile},
+        "error": None
+    })
+
+
+@app.post("/sessions/<session_id>/edits")
+def edit_session(session_id: str):
+    """
+    Body: {"version": int, "edits": [{"start": int, "end": int, "text": str}, ...]}
+    Offsets are JS (UTF-16) string offsets into the text at `version`.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    error = _edits_error(payload)
+
+    if error:
+        return jsonify({"success": False, "data": None, "error": error}), 400
+
+    session = _sessions.get(session_id)
+    if session is None:
+        return jsonify({"success": False, "data": None, "error": "Session not found or expired."}), 404
+
+    try:
+        with session.lock:
+            profile = session.apply_edits(payload["edits"], base_version=payload.get("version"))
+            data = {"version": session.version, "profile": profile, "recomputed": list(session.recomputed)}
+    except EditConflict as e:
+        # client is out of sync: it should resend the full text via POST /sessions
+        return jsonify({"success": False, "data": {"version": session.version}, "error": str(e)}), 409
+    except Exception as e:
+        return jsonify({"success": False, "data": None, "error": f"Parser error: {str(e)}"}), 500
+
+    return jsonify({"success": True, "data": data, "error": None})
+
+
+@app.delete("/sessions/<session_id>")
+def delete_session(session_id: str):
+    if not _sessions.delete(session_id):
+        return jsonify({"success": False, "data": None, "error": "Session not found or expired."}), 404
+    return jsonify({"success": True, "data": None, "error": None})
+
+
 if __name__ == "__main__":
     print("🚀 Starting Flask server...")
     app.run(host="127.0.0.1", port=5000, debug=True)
\ No newline at end of file
@@ -50,11 +50,11 @@ export default function RegistrationPage() {
     setLoading(true);
 
     try {
-      // 1) Upload -> get extracted raw_text
+      // 1) Upload + parse in one round trip (raw text is not sent back)
       const formData = new FormData();
       formData.append("file", file); // MUST be "file"
 
-      const uploadRes = await fetch(`${API_BASE_URL}/upload`, {
+      const uploadRes = await fetch(`${API_BASE_URL}/upload?parse=1`, {
         method: "POST",
         body: formData,
       });
@@ -65,23 +65,9 @@ export default function RegistrationPage() {
         throw new Error(uploadJson?.error || `Upload failed: ${uploadRes.status}`);
       }
 
-      const rawText: string = uploadJson?.data?.raw_text || "";
-      if (!rawText.trim()) throw new Error("No text extracted from resume.");
-
-      // 2) Extract -> structured data
-      const extractRes = await fetch(`${API_BASE_URL}/extract`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ text: rawText }),
-      });
-
-      const extractJson = await extractRes.json();
-
-      if (!extractRes.ok || !extractJson?.success) {
-        throw new Error(extractJson?.error || `Extract failed: ${extractRes.status}`);
-      }
-
-      const data = extractJson.data;
+      // 2) Structured data comes back with the upload
+      const data = uploadJson?.data?.profile;
+      if (!data) throw new Error("No profile extracted from resume.");
 
       // 3) Fill fields
       setFullName(data?.personal?.full_name ?? "");
@@ -0,0 +1,353 @@
+"""
+asyncio version of the backend (same /upload, /upload?parse=1,
+/profiles/<id> and /extract contract as app.py).
+
+- Request bodies are streamed to disk chunk by chunk, so a slow client only
+  costs an idle coroutine, not a thread.
+- PDF/DOCX/TXT extraction runs in the sandboxed extract_pool.ExtractorPool
+  (rlimits, workers killed and replaced on timeout); resume_nlp.extract_profile
+  runs in a process pool that is recycled when a job times out. Image OCR
+  awaits the `tesseract` CLI via asyncio subprocesses.
+- A semaphore caps how many extraction/parse jobs run at once; everything
+  else (accepting, streaming, responding) stays on the event loop.
+
+Run:
+  python async_app.py            # http://127.0.0.1:5000
+"""
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from aiohttp import web
+from werkzeug.utils import secure_filename
+
+import resume_nlp
+from extract_pool import ExtractorPool
+from utils import clean_text
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+WORKERS = int(os.environ.get("DEET_ASYNC_WORKERS", str(os.cpu_count() or 2)))
+MAX_CONCURRENT_JOBS = int(os.environ.get("DEET_ASYNC_MAX_JOBS", str(WORKERS * 2)))
+MAX_UPLOAD_MB = int(os.environ.get("DEET_MAX_UPLOAD_MB", "20"))
+JOB_TIMEOUT = float(os.environ.get("DEET_EXTRACT_TIMEOUT", "60"))
+EXTRACT_CPU_SECONDS = int(os.environ.get("DEET_EXTRACT_CPU_SECONDS", "30"))
+EXTRACT_MEMORY_MB = int(os.environ.get("DEET_EXTRACT_MEMORY_MB", "1024"))
+TESSERACT_CMD = os.environ.get("DEET_TESSERACT_CMD", "tesseract")
+
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg"}
+CHUNK_SIZE = 64 * 1024
+
+# Recent /upload?parse=1 results for GET /profiles/<id> (same as app.py)
+PROFILE_CACHE_SIZE = 256
+
+# {"pool": ProcessPoolExecutor, "extractor": ExtractorPool, "threads":
+# ThreadPoolExecutor, "jobs": asyncio.Semaphore, "profiles": OrderedDict}; a
+# dict so the parse pool can be replaced after a crash or timeout without
+# mutating the frozen app
+STATE = web.AppKey("state", dict)
+
+
+def _ok(data):
+    return web.json_response({"success": True, "data": data, "error": None})
+
+
+def _fail(error: str, status: int):
+    return web.json_response({"success": False, "data": None, "error": error}, status=status)
+
+
+def _flag(request: web.Request, name: str) -> bool:
+    return (request.query.get(name) or "").lower() in {"1", "true", "yes"}
+
+
+def _remember_profile(app: web.Application, text: str, profile: dict) -> str:
+    """Caches a parse result; the id is a content hash, so it doubles as the ETag."""
+    profile_id = hashlib.sha256(text.encode("utf-8")).hexdigest()[:20]
+    profiles = app[STATE]["profiles"]  # only touched on the event loop
+    profiles[profile_id] = profile
+    profiles.move_to_end(profile_id)
+    while len(profiles) > PROFILE_CACHE_SIZE:
+        profiles.popitem(last=False)
+    return profile_id
+
+
+# -----------------------------
+# Process pool side
+# -----------------------------
+def _warm_worker() -> None:
+    import resume_nlp  # noqa: F401
+
+
+def _parse_text(text: str, budget):
+    return resume_nlp.extract_profile(text, budget=budget)
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=WORKERS, initializer=_warm_worker)
+
+
+def _kill_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    shutdown() alone leaves a running job's worker busy forever; kill the
+    workers so a timed-out job really stops.
+    """
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+async def _run_job(app: web.Application, fn, *args):
+    """Run fn in the parse process pool under the job semaphore, with a timeout."""
+    state = app[STATE]
+    async with state["jobs"]:
+        loop = asyncio.get_running_loop()
+        pool = state["pool"]
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(pool, fn, *args), JOB_TIMEOUT)
+        except (asyncio.TimeoutError, BrokenProcessPool):
+            # a stuck or dead worker: replace the pool once (other jobs that
+            # were running in it fail with BrokenProcessPool)
+            if state["pool"] is pool:
+                state["pool"] = _new_pool()
+                _kill_pool(pool)
+            raise
+
+
+def _extract_blocking(extractor: ExtractorPool, filepath: str, extension: str):
+    result = extractor.extract(filepath, extension)
+    return clean_text(result.text) if result.ok else "", result.error
+
+
+async def _extract_file(app: web.Application, filepath: str, extension: str):
+    """
+    Returns (cleaned_text, error_reason_or_None). ExtractorPool enforces the
+    timeout and rlimits itself, killing and replacing the worker, so the call
+    only needs a thread to wait in.
+    """
+    state = app[STATE]
+    async with state["jobs"]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            state["threads"], _extract_blocking, state["extractor"], filepath, extension)
+
+
+async def _ocr_image(filepath: str):
+    """Returns (cleaned_text, error_reason_or_None)."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            TESSERACT_CMD, filepath, "stdout",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        return "", "tesseract is not installed or not on PATH."
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), JOB_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return "", f"OCR timed out after {JOB_TIMEOUT:g}s."
+
+    if proc.returncode != 0:
+        return "", f"tesseract failed: {stderr.decode('utf-8', errors='ignore').strip()[:200]}"
+    return clean_text(stdout.decode("utf-8", errors="ignore")), None
+
+
+# -----------------------------
+# Routes
+# -----------------------------
+async def health_check(request: web.Request):
+    return web.Response(text="Backend is running")
+
+
+async def _save_stream(field, filepath: str) -> int:
+    """Streams a multipart field to disk; returns bytes written (-1 if too large)."""
+    limit = MAX_UPLOAD_MB * 1024 * 1024
+    size = 0
+    with open(filepath, "wb") as f:
+        while True:
+            chunk = await field.read_chunk(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > limit:
+                break
+            f.write(chunk)
+
+    if size > limit:
+        os.remove(filepath)
+        return -1
+    return size
+
+
+async def upload_resume(request: web.Request):
+    """
+    Default: returns {"raw_text"}.
+    ?parse=1 also runs extract_profile and returns {"profile", "profile_id"}
+    (plus "raw_text" only with &raw=1), like app.py.
+    """
+    try:
+        reader = await request.multipart()
+    except Exception:
+        return _fail("Expected 'file' field.", 400)
+
+    field = None
+    while True:
+        part = await reader.next()
+        if part is None:
+            break
+        if part.name == "file":
+            field = part
+            break
+        await part.release()
+
+    if field is None:
+        return _fail("Expected 'file' field.", 400)
+
+    if not field.filename or field.filename.strip() == "":
+        return _fail("No file selected.", 400)
+
+    filename = secure_filename(field.filename)
+    if not filename:
+        return _fail("Invalid file name.", 400)
+
+    _, ext = os.path.splitext(filename)
+    extension = ext.lower().lstrip(".")
+
+    # unique name: many uploads of "resume.pdf" can be in flight at once
+    filepath = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex[:8]}_{filename}")
+    if await _save_stream(field, filepath) < 0:
+        return _fail(f"File too large (max {MAX_UPLOAD_MB} MB).", 413)
+
+    try:
+        if extension in IMAGE_EXTENSIONS:
+            async with request.app[STATE]["jobs"]:
+                cleaned_text, extract_error = await _ocr_image(filepath)
+        else:
+            cleaned_text, extract_error = await _extract_file(request.app, filepath, extension)
+    except Exception as e:
+        cleaned_text, extract_error = "", f"{type(e).__name__}: {e}"
+
+    if extract_error:
+        return _fail(f"Could not extract text from uploaded file: {extract_error}", 422)
+
+    if not cleaned_text or not cleaned_text.strip():
+        return _fail(
+            "Could not extract text from uploaded file. The format may be unsupported or the file may be empty.",
+            422,
+        )
+
+    if not _flag(request, "parse"):
+        return _ok({"raw_text": cleaned_text})
+
+    try:
+        parsed = await _run_job(request.app, _parse_text, cleaned_text, resume_nlp.DEFAULT_BUDGET)
+    except asyncio.TimeoutError:
+        return _fail("Parser error: timed out", 500)
+    except Exception as e:
+        return _fail(f"Parser error: {str(e)}", 500)
+
+    data = {"profile": parsed, "profile_id": _remember_profile(request.app, cleaned_text, parsed)}
+    if _flag(request, "raw"):
+        data["raw_text"] = cleaned_text
+    return _ok(data)
+
+
+async def get_profile(request: web.Request):
+    """Re-fetch a recent parse result; supports If-None-Match -> 304."""
+    profile_id = request.match_info["profile_id"]
+    profile = request.app[STATE]["profiles"].get(profile_id)
+    if profile is None:
+        return _fail("Profile not found or expired.", 404)
+
+    etag = f'W/"{profile_id}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    sent = [t.strip() for t in request.headers.get("If-None-Match", "").split(",")]
+    if etag in sent or f'"{profile_id}"' in sent or "*" in sent:
+        return web.Response(status=304, headers=headers)
+
+    response = _ok({"profile": profile, "profile_id": profile_id})
+    response.headers.update(headers)
+    return response
+
+
+async def extract_structured(request: web.Request):
+    try:
+        payload = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    text = (payload.get("text") or "").strip()
+
+    if not text:
+        return _fail("Missing 'text' in request body", 400)
+
+    try:
+        parsed = await _run_job(request.app, _parse_text, text, resume_nlp.DEFAULT_BUDGET)
+        return _ok(parsed)
+    except asyncio.TimeoutError:
+        return _fail("Parser error: timed out", 500)
+    except Exception as e:
+        return _fail(f"Parser error: {str(e)}", 500)
+
+
+# -----------------------------
+# App
+# -----------------------------
+@web.middleware
+async def cors_middleware(request: web.Request, handler):
+    if request.method == "OPTIONS":
+        response = web.Response()
+    else:
+        response = await handler(request)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+    response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+    return response
+
+
+async def _start_pool(app: web.Application):
+    app[STATE] = {
+        "pool": _new_pool(),
+        "extractor": ExtractorPool(
+            workers=WORKERS,
+            timeout=JOB_TIMEOUT,
+            cpu_seconds=EXTRACT_CPU_SECONDS,
+            memory_mb=EXTRACT_MEMORY_MB,
+        ),
+        "threads": ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="extract"),
+        "jobs": asyncio.Semaphore(MAX_CONCURRENT_JOBS),
+        "profiles": OrderedDict(),
+    }
+    yield
+    app[STATE]["pool"].shutdown(wait=False, cancel_futures=True)
+    app[STATE]["extractor"].close()
+    app[STATE]["threads"].shutdown(wait=False, cancel_futures=True)
+
+
+def create_app() -> web.Application:
+    # uploads are streamed, so the in-memory body limit only guards /extract JSON
+    app = web.Application(middlewares=[cors_middleware], client_max_size=MAX_UPLOAD_MB * 1024 * 1024)
+    app.cleanup_ctx.append(_start_pool)
+    app.router.add_get("/", health_check)
+    app.router.add_post("/upload", upload_resume)
+    app.router.add_get("/profiles/{profile_id}", get_profile)
+    app.router.add_post("/extract", extract_structured)
+    return app
+
+
+if __name__ == "__main__":
+    print("🚀 Starting asyncio server...")
+    # large backlog so connection bursts from many slow clients are not refused
+    web.run_app(create_app(), host="127.0.0.1", port=int(os.environ.get("DEET_PORT", "5000")), backlog=4096)
@@ -1,12 +1,28 @@
+import argparse
 import json
 from pathlib import Path
 from resume_nlp import extract_profile
 
 SAMPLES_DIR = Path("samples")
 OUT_DIR = Path("outputs")
-OUT_DIR.mkdir(exist_ok=True)
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--columnar", metavar="DIR",
+                    help="append profiles to a columnar export (see columnar_export.py) instead of one JSON per resume")
+    args = ap.parse_args()
+
+    if args.columnar:
+        from columnar_export import open_writer, profile_row
+
+        with open_writer(args.columnar) as writer:
+            for p in sorted(SAMPLES_DIR.glob("*.txt")):
+                text = p.read_text(encoding="utf-8", errors="ignore")
+                writer.append(profile_row(extract_profile(text), source=p.name))
+        print(f"✅ {args.columnar} now has {writer.rows} profiles")
+        return
+
+    OUT_DIR.mkdir(exist_ok=True)
     for p in sorted(SAMPLES_DIR.glob("*.txt")):
         text = p.read_text(encoding="utf-8", errors="ignore")
         result = extract_profile(text)
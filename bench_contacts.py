@@ -0,0 +1,82 @@
+"""
+Benchmark: old find_email/find_phone (full-text re.sub + findall) vs the
+one-pass extract_contacts scanner.
+
+  python bench_contacts.py            # samples/*.txt, plain and padded
+"""
+import re
+import time
+from pathlib import Path
+
+from resume_nlp import EMAIL_RE, PHONE_RE, extract_contacts, best_email, best_phone
+
+SAMPLES_DIR = Path("samples")
+
+
+def old_email_phone(text: str):
+    """The pre-extract_contacts implementation, kept here as the baseline."""
+    m = EMAIL_RE.search(text)
+    email = m.group(0) if m else ""
+
+    text = re.sub(r"\b(\d{1,3})\+\s*", r"+\1 ", text)
+    best, best_len = "", 0
+    for c in PHONE_RE.findall(text):
+        digits = re.sub(r"\D", "", c)
+        if 9 <= len(digits) <= 13 and len(digits) > best_len:
+            best, best_len = c.strip(), len(digits)
+    return email, best
+
+
+def _drop_phone(m) -> str:
+    return "" if 9 <= len(re.sub(r"\D", "", m.group(0))) <= 13 else m.group(0)
+
+
+def new_email_phone(text: str):
+    contacts = extract_contacts(text)
+    return best_email(contacts)[0], best_phone(contacts)[0]
+
+
+def bench(fn, docs, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for d in docs:
+            fn(d)
+    return (time.perf_counter() - t0) / (repeat * len(docs)) * 1e6
+
+
+def main():
+    docs = [p.read_text(encoding="utf-8", errors="ignore") for p in sorted(SAMPLES_DIR.glob("*.txt"))]
+    # long resumes: projects / publications with plenty of dates, IDs and GPAs
+    filler = "Project 2019 - 2023 | ID 4471203398 | GPA 8.9/10 | Ref no. 2021-04-118877\n" * 400
+    padded = [d + "\n" + filler for d in docs]
+
+    for d in docs:
+        old, new = old_email_phone(d), new_email_phone(d)
+        flag = "same" if old == new else f"DIFF old={old} new={new}"
+        print(f"  {flag}")
+
+    # an unusable number at the top (too long, a date run) must not hide the
+    # real phone further down; the baseline picks the date run in the second
+    body = "Worked on data pipelines and reporting dashboards for the team.\n" * 80
+    for top in ("Application ID: 12345678901234", "B.Tech 2019 - 2023 - 2024"):
+        d = f"John Doe\n{top}\n{body}Phone: 9876543210"
+        new = new_email_phone(d)[1]
+        flag = "same" if new == "9876543210" else f"DIFF expected=9876543210 new={new}"
+        print(f"  {flag}  ({top})")
+
+    # fallback path: no phone in the top, so the whole body is scanned
+    no_phone = [PHONE_RE.sub(_drop_phone, d) for d in docs]
+    no_phone_padded = [d + "\n" + filler for d in no_phone]
+
+    for label, corpus, repeat in (
+        ("samples", docs, 200),
+        ("samples + 30KB body", padded, 20),
+        ("no phone + 30KB body", no_phone_padded, 20),
+    ):
+        t_old = bench(old_email_phone, corpus, repeat)
+        t_new = bench(new_email_phone, corpus, repeat)
+        print(f"{label:>22}: old {t_old:8.1f} us/doc   new {t_new:8.1f} us/doc   x{t_old / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: python-docx Document tree vs the streaming docx_stream reader.
+
+  python bench_docx.py                # generates large .docx files in a temp dir
+  python bench_docx.py --dir resumes/ # or any folder of real .docx files
+
+Peak memory is the Python heap (tracemalloc); lxml's C allocations behind
+python-docx are not counted, so its real footprint is larger.
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from docx import Document
+
+from docx_stream import read_docx_text
+
+
+def old_docx_text(path: str) -> str:
+    """The pre-docx_stream implementation, kept here as the baseline."""
+    document = Document(path)
+    return "\n".join(para.text for para in document.paragraphs if para.text)
+
+
+def make_corpus(folder: Path, docs: int, paragraphs: int, rows: int):
+    paths = []
+    for i in range(docs):
+        d = Document()
+        d.sections[0].header.paragraphs[0].text = f"Candidate {i} | cand{i}@example.com | +91 98765 {i:05d}"
+        d.add_heading("Experience", level=1)
+        for j in range(paragraphs):
+            p = d.add_paragraph(f"Built and operated service {j} handling ")
+            p.add_run("payments, search and analytics").bold = True
+            p.add_run(" for 2019 - 2023 using Python, Kafka and PostgreSQL.")
+        d.add_heading("Skills", level=1)
+        table = d.add_table(rows=rows, cols=2)
+        for r in range(rows):
+            table.cell(r, 0).text = f"Area {r}"
+            table.cell(r, 1).text = "Python, SQL, Docker, Kubernetes, AWS"
+        path = folder / f"resume_{i}.docx"
+        d.save(str(path))
+        paths.append(str(path))
+    return paths
+
+
+def bench(fn, paths, repeat: int):
+    chars = 0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for p in paths:
+            chars = len(fn(p))
+    ms = (time.perf_counter() - t0) / (repeat * len(paths)) * 1000
+
+    tracemalloc.start()
+    for p in paths:
+        fn(p)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return ms, peak, chars
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", help="folder of .docx files (default: generate a corpus)")
+    ap.add_argument("--docs", type=int, default=5)
+    ap.add_argument("--paragraphs", type=int, default=5000)
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dir:
+            paths = [str(p) for p in sorted(Path(args.dir).glob("*.docx"))]
+        else:
+            print(f"generating {args.docs} docs x {args.paragraphs} paragraphs + {args.rows}-row table ...")
+            paths = make_corpus(Path(tmp), args.docs, args.paragraphs, args.rows)
+        if not paths:
+            print("no .docx files found")
+            return
+
+        for label, fn in (("python-docx", old_docx_text), ("docx_stream", read_docx_text)):
+            ms, peak, chars = bench(fn, paths, args.repeat)
+            print(f"{label:>12}: {ms:8.1f} ms/doc   peak {peak:7.1f} MB   {chars} chars (last doc)")
+
+
+if __name__ == "__main__":
+    main()
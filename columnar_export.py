@@ -0,0 +1,495 @@
+"""
+Columnar export of parsed profiles for corpus-scale analytics.
+
+One JSON file per resume means opening millions of files to answer
+"skill frequency by qualification". This writes the extract_profile fields
+as columns instead, appended in chunks:
+
+  - Parquet (one part file per writer session) when pyarrow is installed
+  - otherwise a plain column directory: one binary file per column that can
+    be memory-mapped and read without parsing anything else
+
+Either way read_columns() loads only the columns a query asks for.
+
+  python columnar_export.py export outputs/ profiles/      # existing JSON files -> columns
+  python columnar_export.py skills-by profiles/ highest_qualification
+  python columnar_export.py head profiles/ full_name,skills,years_experience
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import mmap
+import os
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # column-directory fallback
+    pa = None
+    pq = None
+
+# column name -> type ("str", "f64", "i64", "list<str>")
+SCHEMA: Dict[str, str] = {
+    "source": "str",
+    "full_name": "str",
+    "email": "str",
+    "phone": "str",
+    "highest_qualification": "str",
+    "branch_or_major": "str",
+    "institute": "str",
+    "employment_status": "str",
+    "years_experience": "f64",  # NaN when unknown
+    "skills": "list<str>",
+    "experience_count": "i64",
+    "warnings": "list<str>",
+    "conf_full_name": "f64",
+    "conf_email": "f64",
+    "conf_phone": "f64",
+    "conf_education": "f64",
+    "conf_skills": "f64",
+    "conf_employment": "f64",
+    "conf_experience_details": "f64",
+}
+
+COLUMNS_FORMAT = "deet-columns/1"
+SCHEMA_FILE = "_schema.json"
+CHUNK_ROWS = 10000
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def profile_row(profile: Dict, source: str = "") -> Dict:
+    """Flattens an extract_profile result into one row of SCHEMA."""
+    personal = profile.get("personal") or {}
+    education = profile.get("education") or {}
+    employment = profile.get("employment") or {}
+    confidence = profile.get("confidence") or {}
+
+    row = {
+        "source": source,
+        "full_name": personal.get("full_name") or "",
+        "email": personal.get("email") or "",
+        "phone": personal.get("phone") or "",
+        "highest_qualification": education.get("highest_qualification") or "",
+        "branch_or_major": education.get("branch_or_major") or "",
+        "institute": education.get("institute") or "",
+        "employment_status": employment.get("status") or "",
+        "years_experience": _to_float(employment.get("years_experience")),
+        "skills": list(profile.get("skills") or []),
+        "experience_count": len(profile.get("experience_details") or []),
+        "warnings": list(profile.get("warnings") or []),
+    }
+    for field in ("full_name", "email", "phone", "education", "skills", "employment", "experience_details"):
+        row[f"conf_{field}"] = _to_float(confidence.get(field))
+    return row
+
+
+# -----------------------------
+# Column directory (no pyarrow)
+# -----------------------------
+# Files per column (int64/float64 arrays in the byte order recorded in _schema.json):
+#   f64 / i64    <name>.f64 / <name>.i64
+#   str          <name>.off (end offset of each value) + <name>.dat (UTF-8)
+#   list<str>    <name>.lst (end index of each row's values) + <name>.val.off + <name>.val.dat
+# _schema.json holds the committed row count; it is replaced atomically after
+# each chunk, and anything past it (a chunk torn by a crash) is truncated away
+# when the directory is opened for appending again.
+def _files(name: str, kind: str) -> List[str]:
+    if kind in ("f64", "i64"):
+        return [f"{name}.{kind}"]
+    if kind == "str":
+        return [f"{name}.off", f"{name}.dat"]
+    return [f"{name}.lst", f"{name}.val.off", f"{name}.val.dat"]
+
+
+def _last_int64(path: Path, count: int) -> int:
+    """Value at index count-1 of an int64 file (0 when count is 0)."""
+    if count <= 0:
+        return 0
+    with open(path, "rb") as f:
+        f.seek((count - 1) * 8)
+        values = array("q")
+        values.frombytes(f.read(8))
+        return values[0]
+
+
+def _read_meta(path: Path) -> Optional[Dict]:
+    try:
+        with open(path / SCHEMA_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class ColumnDirWriter:
+    def __init__(self, path: str, chunk_rows: int = CHUNK_ROWS):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self._buffer: List[Dict] = []
+
+        meta = _read_meta(self.path)
+        if meta is not None and meta.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path} was written on a {meta.get('byteorder')}-endian machine")
+        self.rows = meta["rows"] if meta else 0
+        self._truncate_to_committed()
+
+    def _truncate_to_committed(self) -> None:
+        n = self.rows
+        for name, kind in SCHEMA.items():
+            if kind in ("f64", "i64"):
+                sizes = {f"{name}.{kind}": n * 8}
+            elif kind == "str":
+                sizes = {f"{name}.off": n * 8, f"{name}.dat": None}
+            else:
+                sizes = {f"{name}.lst": n * 8, f"{name}.val.off": None, f"{name}.val.dat": None}
+
+            for filename in _files(name, kind):
+                (self.path / filename).touch()
+
+            if kind == "str":
+                sizes[f"{name}.dat"] = _last_int64(self.path / f"{name}.off", n)
+            elif kind == "list<str>":
+                values = _last_int64(self.path / f"{name}.lst", n)
+                sizes[f"{name}.val.off"] = values * 8
+                sizes[f"{name}.val.dat"] = _last_int64(self.path / f"{name}.val.off", values)
+
+            for filename, size in sizes.items():
+                with open(self.path / filename, "r+b") as f:
+                    f.truncate(size)
+
+    def append(self, row: Dict) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def _append_strings(self, off_file: str, dat_file: str, values: Iterable[str]) -> int:
+        end = os.path.getsize(self.path / dat_file)
+        offsets = array("q")
+        blob = bytearray()
+        for value in values:
+            data = (value or "").encode("utf-8")
+            blob += data
+            end += len(data)
+            offsets.append(end)
+        with open(self.path / dat_file, "ab") as f:
+            f.write(blob)
+        with open(self.path / off_file, "ab") as f:
+            offsets.tofile(f)
+        return len(offsets)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+
+        for name, kind in SCHEMA.items():
+            if kind in ("f64", "i64"):
+                typecode = "d" if kind == "f64" else "q"
+                with open(self.path / f"{name}.{kind}", "ab") as f:
+                    array(typecode, (r[name] for r in rows)).tofile(f)
+            elif kind == "str":
+                self._append_strings(f"{name}.off", f"{name}.dat", (r[name] for r in rows))
+            else:
+                count = os.path.getsize(self.path / f"{name}.val.off") // 8
+                ends = array("q")
+                for r in rows:
+                    count += len(r[name])
+                    ends.append(count)
+                self._append_strings(f"{name}.val.off", f"{name}.val.dat", (v for r in rows for v in r[name]))
+                with open(self.path / f"{name}.lst", "ab") as f:
+                    ends.tofile(f)
+
+        self.rows += len(rows)
+        meta = {"format": COLUMNS_FORMAT, "rows": self.rows, "byteorder": sys.byteorder, "columns": SCHEMA}
+        tmp = self.path / f"{SCHEMA_FILE}.tmp"
+        tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path / SCHEMA_FILE)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Columns(dict):
+    """
+    read_columns() result, {column: values}. close() (or a with block)
+    unmaps the column files; values already read stay valid.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._opened: List = []  # mmaps and the memoryviews over them, in creation order
+
+    def close(self) -> None:
+        # views first: an mmap cannot be closed while a view exports it
+        for buf in reversed(self._opened):
+            if isinstance(buf, memoryview):
+                buf.release()
+            else:
+                buf.close()
+        self._opened = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _map(path: Path, opened: List):
+    """Read-only memory map of a file ("" for an empty file)."""
+    if os.path.getsize(path) == 0:
+        return b""
+    with open(path, "rb") as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    opened.append(m)
+    return m
+
+
+def _typed(buf, typecode: str, count: int, opened: List) -> memoryview:
+    base = memoryview(buf)
+    typed = base.cast(typecode)
+    view = typed[:count]
+    opened.extend((base, typed, view))
+    return view
+
+
+class StrColumn(Sequence):
+    """Lazily decoded string column over memory-mapped offsets + data."""
+
+    def __init__(self, offsets: memoryview, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start = self._offsets[i - 1] if i else 0
+        return self._data[start:self._offsets[i]].decode("utf-8")
+
+
+class ListColumn(Sequence):
+    """list<str> column: each item is the row's list of values."""
+
+    def __init__(self, ends: memoryview, values: StrColumn):
+        self._ends = ends
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start = self._ends[i - 1] if i else 0
+        return self._values[start:self._ends[i]]
+
+
+def _read_column_dir(path: Path, meta: Dict, columns: Sequence[str]) -> Columns:
+    rows = meta["rows"]
+    out = Columns()
+    opened = out._opened
+
+    def int64s(file: Path, count: int) -> memoryview:
+        return _typed(_map(file, opened), "q", count, opened)
+
+    for name in columns:
+        kind = meta["columns"][name]
+        if kind in ("f64", "i64"):
+            typecode = "d" if kind == "f64" else "q"
+            out[name] = _typed(_map(path / f"{name}.{kind}", opened), typecode, rows, opened)
+        elif kind == "str":
+            out[name] = StrColumn(int64s(path / f"{name}.off", rows), _map(path / f"{name}.dat", opened))
+        else:
+            ends = int64s(path / f"{name}.lst", rows)
+            count = ends[-1] if rows else 0
+            values = StrColumn(int64s(path / f"{name}.val.off", count), _map(path / f"{name}.val.dat", opened))
+            out[name] = ListColumn(ends, values)
+    return out
+
+
+# -----------------------------
+# Parquet (pyarrow)
+# -----------------------------
+def _arrow_schema():
+    types = {"str": pa.string(), "f64": pa.float64(), "i64": pa.int64(), "list<str>": pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind in SCHEMA.items()])
+
+
+class ParquetWriter:
+    """Appends row groups to a new part file; a directory of parts is one dataset."""
+
+    def __init__(self, path: str, chunk_rows: int = CHUNK_ROWS):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._buffer: List[Dict] = []
+        self._schema = _arrow_schema()
+        part = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.parquet"
+        # written under a temp name so readers never open a half-written file
+        self._final = self.path / part
+        self._tmp = self.path / f".{part}.tmp"
+        self._writer = pq.ParquetWriter(str(self._tmp), self._schema, compression="zstd")
+
+    def append(self, row: Dict) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self._schema))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+        if self.rows:
+            os.replace(self._tmp, self._final)
+        else:
+            os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def detect_format(path: str) -> Optional[str]:
+    p = Path(path)
+    if (p / SCHEMA_FILE).exists():
+        return "columns"
+    if p.is_dir() and any(p.glob("*.parquet")):
+        return "parquet"
+    return None
+
+
+def open_writer(path: str, chunk_rows: int = CHUNK_ROWS, fmt: str = "auto"):
+    """
+    Writer for `path` (a directory). "auto" keeps the format already there,
+    else Parquet when pyarrow is installed, else the column directory.
+    """
+    if fmt == "auto":
+        fmt = detect_format(path) or ("parquet" if pq is not None else "columns")
+    if fmt == "parquet":
+        if pq is None:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+        return ParquetWriter(path, chunk_rows)
+    return ColumnDirWriter(path, chunk_rows)
+
+
+def read_columns(path: str, columns: Optional[Sequence[str]] = None) -> Columns:
+    """
+    {column: sequence of values} for just the requested columns (all by
+    default). Column directories are memory-mapped and decoded lazily; use
+    the result in a with block (or call close()) to unmap them.
+    """
+    columns = list(columns or SCHEMA)
+    unknown = [c for c in columns if c not in SCHEMA]
+    if unknown:
+        raise KeyError(f"Unknown columns: {', '.join(unknown)}")
+
+    fmt = detect_format(path)
+    if fmt == "parquet":
+        if pq is None:
+            raise RuntimeError("Reading Parquet needs pyarrow: pip install pyarrow")
+        return Columns(pq.read_table(path, columns=columns).to_pydict())
+    if fmt == "columns":
+        p = Path(path)
+        return _read_column_dir(p, _read_meta(p), columns)
+    raise FileNotFoundError(f"No columnar export found in {path}")
+
+
+def skills_by(path: str, column: str, top: int = 10) -> Dict[str, List]:
+    """Skill frequency grouped by another column, e.g. highest_qualification."""
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    with read_columns(path, ["skills", column]) as cols:
+        for skills, key in zip(cols["skills"], cols[column]):
+            counts[key or "(unknown)"].update(skills)
+    return {key: c.most_common(top) for key, c in sorted(counts.items())}
+
+
+def _json_value(value):
+    """NaN (unknown years_experience) -> None, since JSON has no NaN."""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Columnar export of parsed profiles.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("export", help="convert per-resume JSON files (batch_extract outputs/) to columns")
+    p.add_argument("json_dir")
+    p.add_argument("out")
+    p.add_argument("--format", choices=["auto", "parquet", "columns"], default="auto")
+
+    p = sub.add_parser("skills-by", help="top skills per value of a column")
+    p.add_argument("path")
+    p.add_argument("column")
+    p.add_argument("--top", type=int, default=10)
+
+    p = sub.add_parser("head", help="print the first rows of some columns")
+    p.add_argument("path")
+    p.add_argument("columns", help="comma separated")
+    p.add_argument("-n", type=int, default=10)
+
+    args = ap.parse_args()
+
+    if args.cmd == "export":
+        count = 0
+        with open_writer(args.out, fmt=args.format) as writer:
+            for f in sorted(Path(args.json_dir).glob("*.json")):
+                writer.append(profile_row(json.loads(f.read_text(encoding="utf-8")), source=f.stem))
+                count += 1
+        print(f"✅ {count} profiles -> {args.out} ({type(writer).__name__})")
+
+    elif args.cmd == "skills-by":
+        for key, top in skills_by(args.path, args.column, args.top).items():
+            print(f"{key}: " + ", ".join(f"{skill} ({n})" for skill, n in top))
+
+    elif args.cmd == "head":
+        names = [c.strip() for c in args.columns.split(",") if c.strip()]
+        with read_columns(args.path, names) as cols:
+            total = len(cols[names[0]]) if names else 0
+            for i in range(min(args.n, total)):
+                row = {name: _json_value(cols[name][i]) for name in names}
+                print(json.dumps(row, ensure_ascii=False, allow_nan=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Streaming DOCX text extraction straight from the OOXML zip.
+
+python-docx builds the whole document tree and only exposes body paragraphs,
+so text in tables, text boxes and headers/footers (where many resume
+templates put contact info and skills) is lost. This reads the XML parts
+with an incremental parser instead:
+
+  - headers first (contact info), then word/document.xml, then footers
+  - one line per paragraph, in document order, including table cells and
+    text boxes
+  - finished elements are detached from the tree as soon as they are read,
+    so memory stays flat no matter how large the document is
+
+  python docx_stream.py resume.docx
+"""
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+_P = W + "p"
+_T = W + "t"
+_TAB = W + "tab"
+_BREAKS = {W + "br", W + "cr"}
+_HYPHENS = {W + "noBreakHyphen": "-", W + "softHyphen": ""}
+# mc:Fallback repeats the mc:Choice content (e.g. a text box as VML)
+_SKIP = {MC + "Fallback"}
+
+DOCUMENT_PART = "word/document.xml"
+
+
+def _part_names(zf: zipfile.ZipFile, kind: str) -> List[str]:
+    """word/header1.xml, word/header2.xml, ... in numeric order."""
+    prefix = f"word/{kind}"
+    names = [n for n in zf.namelist() if n.startswith(prefix) and n.endswith(".xml")]
+
+    def number(name: str) -> int:
+        digits = name[len(prefix):-4]
+        return int(digits) if digits.isdigit() else 0
+
+    return sorted(names, key=number)
+
+
+def iter_part_paragraphs(stream) -> Iterator[str]:
+    """Yields the text of each non-empty w:p in an XML part, in order."""
+    stack = []       # open elements, so finished ones can be detached
+    buffers = []     # one text buffer per open paragraph (text boxes nest)
+    skip_depth = 0
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag in _SKIP:
+                skip_depth += 1
+            elif tag == _P and not skip_depth:
+                buffers.append([])
+            continue
+
+        stack.pop()
+        if tag in _SKIP:
+            skip_depth -= 1
+        elif skip_depth:
+            pass
+        elif tag == _T:
+            if buffers and elem.text:
+                buffers[-1].append(elem.text)
+        elif tag == _TAB:
+            if buffers:
+                buffers[-1].append("\t")
+        elif tag in _BREAKS:
+            if buffers:
+                buffers[-1].append("\n")
+        elif tag in _HYPHENS:
+            if buffers:
+                buffers[-1].append(_HYPHENS[tag])
+        elif tag == _P and buffers:
+            text = "".join(buffers.pop())
+            if text.strip():
+                yield text
+
+        # only paragraph-level children of the current container are kept
+        # until they end; drop them now so the tree never grows
+        if stack and (tag == _P or tag in _SKIP or not buffers):
+            stack[-1].remove(elem)
+
+
+def iter_docx_paragraphs(file_path: str) -> Iterator[str]:
+    """Headers, body and footers of a .docx, one paragraph at a time."""
+    with zipfile.ZipFile(file_path) as zf:
+        if DOCUMENT_PART not in zf.namelist():
+            raise KeyError(f"{DOCUMENT_PART} not found; not a Word document?")
+
+        # the same header is often repeated for first/even/default pages
+        seen = set()
+        for name in _part_names(zf, "header"):
+            with zf.open(name) as f:
+                for text in iter_part_paragraphs(f):
+                    if text not in seen:
+                        seen.add(text)
+                        yield text
+
+        with zf.open(DOCUMENT_PART) as f:
+            yield from iter_part_paragraphs(f)
+
+        seen = set()
+        for name in _part_names(zf, "footer"):
+            with zf.open(name) as f:
+                for text in iter_part_paragraphs(f):
+                    if text not in seen:
+                        seen.add(text)
+                        yield text
+
+
+def read_docx_text(file_path: str) -> str:
+    return "\n".join(iter_docx_paragraphs(file_path))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        sys.exit(2)
+    for line in iter_docx_paragraphs(sys.argv[1]):
+        print(line)
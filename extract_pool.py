@@ -0,0 +1,235 @@
+# extract_pool.py
+"""
+Isolated extractor pool for utils.extract_text.
+
+pdfplumber / python-docx / PIL + tesseract run in pre-warmed worker
+processes instead of the API process. Each worker has an address-space
+limit and a per-document CPU-time limit (via `resource`, Unix only), and
+every job has a wall-clock timeout. A malformed or decompression-bomb file
+can only take down a worker; dead, timed-out or worn-out workers are
+replaced automatically, and the reason is reported instead of "".
+"""
+from __future__ import annotations
+
+import atexit
+import multiprocessing as mp
+import os
+import queue
+import signal
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import resource  # Unix only
+except ImportError:  # Windows: timeouts still apply, rlimits are skipped
+    resource = None
+
+
+@dataclass
+class ExtractResult:
+    text: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# -----------------------------
+# Worker process side
+# -----------------------------
+def _limit_memory(memory_mb: int) -> None:
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _arm_cpu_limit(cpu_seconds: int) -> None:
+    """
+    RLIMIT_CPU counts the whole process lifetime, so move the soft limit to
+    "CPU used so far + cpu_seconds" before every document.
+    """
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, cpu_seconds: int, memory_mb: int) -> None:
+    # own process group, so killing the worker also kills the tesseract
+    # processes pytesseract started from it
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    # pre-warm: pay for the heavy imports once, before the first document
+    import utils
+
+    _limit_memory(memory_mb)
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        file_path, extension = task
+        _arm_cpu_limit(cpu_seconds)
+        try:
+            text = utils.extract_text_or_raise(file_path, extension)
+            conn.send(("ok", text))
+        except MemoryError:
+            # heap may be huge/fragmented now -> "fatal" asks the pool to recycle us
+            conn.send(("fatal", "Memory limit exceeded while extracting text."))
+            break
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+# -----------------------------
+# Pool (API process side)
+# -----------------------------
+class _Worker:
+    def __init__(self, ctx, cpu_seconds: int, memory_mb: int):
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, memory_mb),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.tasks = 0
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.kill_children()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def kill_children(self) -> None:
+        """SIGKILLs what is left of the worker's process group (OCR subprocesses)."""
+        if not hasattr(os, "killpg") or self.process.pid is None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _death_reason(worker: _Worker) -> str:
+    worker.process.join(timeout=1)
+    code = worker.process.exitcode
+    sigxcpu = getattr(signal, "SIGXCPU", None)
+    sigkill = getattr(signal, "SIGKILL", None)
+    if sigxcpu is not None and code == -sigxcpu:
+        return "CPU time limit exceeded while extracting text."
+    if sigkill is not None and code == -sigkill:
+        return "Extractor was killed (likely out of memory)."
+    return f"Extractor crashed (exit code {code})."
+
+
+class ExtractorPool:
+    """
+    Fixed-size pool of warm extractor processes.
+
+    extract() is thread-safe: each call checks out an idle worker, so at most
+    `workers` documents are parsed at once and other callers wait (up to
+    `timeout` seconds) for a free worker.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout: float = 60.0,
+        cpu_seconds: int = 30,
+        memory_mb: int = 1024,
+        max_tasks_per_worker: int = 200,
+        start_method: str = "spawn",
+    ):
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+
+        self._ctx = mp.get_context(start_method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(max(1, workers)):
+            self._idle.put(self._spawn())
+
+        atexit.register(self.close)
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self.cpu_seconds, self.memory_mb)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _retire(self, worker: _Worker) -> None:
+        with self._lock:
+            self._all.discard(worker)
+        worker.kill()
+
+    def extract(self, file_path: str, extension: str) -> ExtractResult:
+        if self._closed:
+            return ExtractResult("", "Extractor pool is shut down.")
+
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            return ExtractResult("", "Extractor pool is busy, please retry.")
+
+        healthy = False
+        try:
+            worker.conn.send((file_path, extension))
+            if not worker.conn.poll(self.timeout):
+                return ExtractResult("", f"Extraction timed out after {self.timeout:g}s.")
+
+            status, payload = worker.conn.recv()
+            worker.tasks += 1
+            healthy = status != "fatal"
+            if status == "ok":
+                return ExtractResult(payload or "")
+            return ExtractResult("", payload)
+
+        except (EOFError, OSError):
+            return ExtractResult("", _death_reason(worker))
+
+        finally:
+            if not healthy or worker.tasks >= self.max_tasks_per_worker or self._closed:
+                self._retire(worker)
+                if not self._closed:
+                    worker = self._spawn()
+            if not self._closed:
+                self._idle.put(worker)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            worker.stop()
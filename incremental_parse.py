@@ -0,0 +1,210 @@
+# incremental_parse.py
+"""
+Incremental re-parsing for live edits (register form).
+
+A ParseSession keeps the current resume text plus the last input/output of
+every extractor. Edits arrive as text diffs; after applying them the text is
+re-normalized and re-split (both cheap, linear passes), and each extractor is
+re-run only if the exact input it reads changed:
+
+  email / phone       -> top of the document (whole text if not found there)
+  full_name           -> first lines + "__top__"
+  skills / education  -> their section (whole text when the section is absent)
+  employment          -> "experience" + "__top__"
+  experience_details  -> "experience"
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import resume_nlp
+
+
+def _first_lines(text: str, n: int) -> str:
+    out: List[str] = []
+    start = 0
+    while len(out) < n and start <= len(text):
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+        line = text[start:end].strip()
+        if line:
+            out.append(line)
+        start = end + 1
+    return "\n".join(out)
+
+
+def _utf16_to_index(text: str, offset: int) -> int:
+    """JS string offsets count UTF-16 units; astral chars (emoji) take two."""
+    if offset <= 0:
+        return 0
+    units = 0
+    for i, ch in enumerate(text):
+        if units >= offset:
+            return i
+        units += 2 if ord(ch) > 0xFFFF else 1
+    return len(text)
+
+
+class EditConflict(Exception):
+    """The client's base version does not match the session's version."""
+
+
+class ParseSession:
+    def __init__(self, text: str = "", budget: Optional[Dict[str, int]] = None):
+        self.id = uuid.uuid4().hex
+        self.budget = budget
+        self.text = text
+        self.version = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+        self.recomputed: List[str] = []
+
+        self._memo: Dict[str, Tuple[object, Tuple]] = {}
+        self._profile: Dict = {}
+        self._reparse()
+
+    @property
+    def profile(self) -> Dict:
+        return self._profile
+
+    # -----------------------------
+    # Edits
+    # -----------------------------
+    def apply_edits(self, edits: List[Dict], base_version: Optional[int] = None, utf16: bool = True) -> Dict:
+        """
+        edits: [{"start": int, "end": int, "text": str}, ...] applied in order,
+        each against the text produced by the previous one (like a sequence of
+        textarea changes). Offsets are UTF-16 units by default (JS strings).
+        """
+        if base_version is not None and base_version != self.version:
+            raise EditConflict(f"Session is at version {self.version}, edit is based on {base_version}.")
+
+        text = self.text
+        has_astral = utf16 and any(ord(ch) > 0xFFFF for ch in text)
+        for edit in edits:
+            start, end = int(edit.get("start", 0)), int(edit.get("end", edit.get("start", 0)))
+            if has_astral:
+                start, end = _utf16_to_index(text, start), _utf16_to_index(text, end)
+            start = max(0, min(start, len(text)))
+            end = max(start, min(end, len(text)))
+            insert = edit.get("text") or ""
+            text = text[:start] + insert + text[end:]
+            if utf16 and not has_astral:
+                has_astral = any(ord(ch) > 0xFFFF for ch in insert)
+
+        return self.set_text(text)
+
+    def set_text(self, text: str) -> Dict:
+        self.text = text
+        self.version += 1
+        self._reparse()
+        return self._profile
+
+    # -----------------------------
+    # Memoized re-parse
+    # -----------------------------
+    def _cached(self, field: str, key: Tuple, compute: Callable[[], object]) -> object:
+        hit = self._memo.get(field)
+        if hit is not None and hit[1] == key:
+            return hit[0]
+        value = compute()
+        self._memo[field] = (value, key)
+        self.recomputed.append(field)
+        return value
+
+    def _contacts(self, text: str) -> Dict[str, List[Dict]]:
+        """
+        extract_contacts only reads past the head when the head lacks an email
+        or a labeled usable phone (contact_body_kinds), so the cache key is the
+        head alone in the common case.
+        """
+        head_end = resume_nlp.contact_head_end(text)
+        head = text[:head_end]
+        hit = self._memo.get("contacts")
+        if hit is not None:
+            old_head, old_text = hit[1]
+            if old_head == head and (old_text is None or old_text == text):
+                return hit[0]
+
+        contacts = resume_nlp.extract_contacts(text)
+
+        used_tail = head_end < len(text) and bool(resume_nlp.contact_body_kinds(contacts, head_end))
+        self._memo["contacts"] = (contacts, (head, text if used_tail else None))
+        self.recomputed.append("contacts")
+        return contacts
+
+    def _reparse(self) -> None:
+        self.last_used = time.monotonic()
+        self.recomputed = []
+
+        text, sections, truncated = resume_nlp.prepare_text(self.text, self.budget)
+        top = sections.get("__top__", "")
+        exp = sections.get("experience", "")
+        skills_sec = sections.get("skills", "")
+        edu_sec = sections.get("education", "")
+
+        contacts = self._contacts(text)
+        fields = {
+            "email": resume_nlp.best_email(contacts),
+            "phone": resume_nlp.best_phone(contacts),
+            "skills": self._cached(
+                "skills", (skills_sec,) if skills_sec else ("", text),
+                lambda: resume_nlp.extract_skills(text, sections)),
+            "education": self._cached(
+                "education", (edu_sec,) if edu_sec else ("", text),
+                lambda: resume_nlp.extract_education(text, sections)),
+            "employment": self._cached(
+                "employment", (exp, top),
+                lambda: resume_nlp.extract_employment(text, sections)),
+            "full_name": self._cached(
+                "full_name", (_first_lines(text, 15), _first_lines(top, 15)),
+                lambda: resume_nlp.extract_name(text, sections)),
+            "experience_details": self._cached(
+                "experience_details", (exp,),
+                lambda: resume_nlp.extract_experience_details(text, sections)),
+        }
+        self._profile = resume_nlp.assemble_profile(fields, truncated)
+
+
+class SessionStore:
+    """Thread-safe LRU of ParseSessions with an idle timeout."""
+
+    def __init__(self, max_sessions: int = 1000, idle_seconds: float = 1800.0):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, ParseSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, text: str, budget: Optional[Dict[str, int]] = None) -> ParseSession:
+        session = ParseSession(text, budget)
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> Optional[ParseSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.idle_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
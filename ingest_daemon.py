@@ -0,0 +1,353 @@
+"""
+Spool-directory ingestion daemon for bulk resume drops.
+
+  python ingest_daemon.py /srv/spool              # runs until Ctrl+C / SIGTERM
+  python ingest_daemon.py /srv/spool --once       # drain what is there, then exit
+
+Layout under the spool directory (created if missing):
+
+  incoming/     partners drop files here (pdf, docx, txt, png, jpg, jpeg)
+  results/      <file name>.json with the extract_profile output
+  processed/    source files that were parsed
+  failed/       source files that could not be parsed, plus <file name>.error.json
+  status.json   backlog, in-flight, counters and throughput
+
+A file is picked up once its size and mtime have stayed the same for
+--settle seconds, so half-copied files are left alone. Extraction runs in
+the sandboxed ExtractorPool (per-file timeout and memory limit); at most
+--workers files are in flight and the rest wait on disk. Results and
+status are written to a temp file and renamed into place, so readers never
+see a partial JSON. A file that cannot be moved out of incoming/ (permissions,
+a spool spanning devices) is left there, reported as stuck in status.json and
+not retried until it changes. New files are noticed through watchdog
+(inotify/FSEvents/ReadDirectoryChangesW) when it is installed, otherwise by
+polling the directory every --poll seconds.
+"""
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import resume_nlp
+from extract_pool import ExtractorPool
+from utils import clean_text
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # polling fallback
+    Observer = None
+
+SUPPORTED_EXTENSIONS = {"txt", "pdf", "docx", "png", "jpg", "jpeg"}
+# names uploaders use while a copy is still in progress
+PARTIAL_SUFFIXES = (".part", ".partial", ".tmp", ".crdownload", ".filepart")
+# with watchdog, still rescan now and then in case an event was missed
+WATCHDOG_RESCAN_SECONDS = 30.0
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def write_json_atomic(path: str, data) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _unique_name(folder: str, name: str) -> str:
+    """name, or name with a timestamp if folder already has one (re-sent files)."""
+    if not os.path.exists(os.path.join(folder, name)):
+        return name
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{int(time.time() * 1000)}{ext}"
+
+
+class IngestDaemon:
+    def __init__(
+        self,
+        spool: str,
+        workers: int = 2,
+        settle: float = 2.0,
+        poll: float = 2.0,
+        timeout: float = 60.0,
+        status_every: float = 5.0,
+    ):
+        self.dirs = {name: os.path.join(spool, name) for name in ("incoming", "results", "processed", "failed")}
+        for folder in self.dirs.values():
+            os.makedirs(folder, exist_ok=True)
+        self.status_path = os.path.join(spool, "status.json")
+
+        self.workers = max(1, workers)
+        self.settle = settle
+        self.poll = poll
+        self.timeout = timeout
+        self.status_every = status_every
+        self.budget = resume_nlp.DEFAULT_BUDGET
+
+        self._pool = None
+        self._executor = None
+        self._observer = None
+        self.watcher = None
+
+        self._seen = {}  # name -> (size, mtime_ns) from the previous scan
+        self._inflight = set()
+        self._stuck = {}  # name -> (size, mtime_ns) of files that could not be moved out
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self.started_at = _now_iso()
+        self.backlog = 0
+        self.processed = 0
+        self.failed = 0
+        self.last_error = None
+        self._finished = deque()  # monotonic completion times, last 5 minutes
+        self._durations = deque(maxlen=500)
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def stop(self, *_args) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _start_watcher(self) -> str:
+        if Observer is None:
+            return "polling"
+        handler = FileSystemEventHandler()
+        handler.on_any_event = lambda event: self._wake.set()
+        self._observer = Observer()
+        self._observer.schedule(handler, self.dirs["incoming"], recursive=False)
+        self._observer.start()
+        return "watchdog"
+
+    def run(self, once: bool = False) -> None:
+        self._pool = ExtractorPool(workers=self.workers, timeout=self.timeout)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.watcher = self._start_watcher()
+        print(f"📥 Watching {self.dirs['incoming']} ({self.watcher}, {self.workers} workers)")
+
+        last_status = 0.0
+        try:
+            while not self._stop.is_set():
+                pending = self._submit_ready()
+
+                now = time.monotonic()
+                if now - last_status >= self.status_every:
+                    self.write_status()
+                    last_status = now
+
+                with self._lock:
+                    idle = not self._inflight
+                if once and idle and self.backlog == 0:
+                    break
+
+                # unsettled files need a re-check after `settle` even without events
+                if pending:
+                    wait = self.settle
+                elif self._observer is not None:
+                    wait = WATCHDOG_RESCAN_SECONDS
+                else:
+                    wait = self.poll
+                self._wake.wait(min(wait, self.status_every))
+                self._wake.clear()
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+            self._executor.shutdown(wait=True)  # let in-flight files finish
+            self._pool.close()
+            self.write_status()
+            print(f"🛑 Stopped: {self.processed} processed, {self.failed} failed")
+
+    # -----------------------------
+    # Scanning
+    # -----------------------------
+    def _scan(self):
+        """Returns (ready names oldest first, number of files still settling)."""
+        wall_now = time.time()
+        current, ready = {}, []
+        stuck = set()
+        backlog = 0
+
+        with os.scandir(self.dirs["incoming"]) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or name.lower().endswith(PARTIAL_SUFFIXES):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:  # removed while scanning
+                    continue
+
+                sig = (st.st_size, st.st_mtime_ns)
+                with self._lock:
+                    if self._stuck.get(name) == sig:
+                        stuck.add(name)
+                        continue
+                    inflight = name in self._inflight
+
+                backlog += 1
+                if inflight:
+                    continue
+
+                current[name] = sig
+                if self._seen.get(name) == sig and wall_now - st.st_mtime >= self.settle:
+                    ready.append((st.st_mtime_ns, name))
+
+        self._seen = current
+        self.backlog = backlog
+        with self._lock:
+            # gone, or replaced by a new copy: forget it (in-flight names may
+            # have been marked after they were scanned)
+            for name in set(self._stuck) - stuck - self._inflight:
+                del self._stuck[name]
+        ready.sort()
+        return [name for _, name in ready], len(current) - len(ready)
+
+    def _submit_ready(self) -> int:
+        ready, settling = self._scan()
+        for name in ready:
+            with self._lock:
+                if len(self._inflight) >= self.workers:
+                    break
+                self._inflight.add(name)
+            self._seen.pop(name, None)
+            self._executor.submit(self._process, name)
+        return settling + len(ready)
+
+    # -----------------------------
+    # Processing (executor threads)
+    # -----------------------------
+    def _extract(self, src: str, name: str):
+        """Returns (profile, None) or (None, error_reason)."""
+        ext = os.path.splitext(name)[1].lower().lstrip(".")
+        if ext not in SUPPORTED_EXTENSIONS:
+            return None, f"Unsupported file type: .{ext}" if ext else "File has no extension."
+
+        result = self._pool.extract(src, ext)
+        if result.error:
+            return None, result.error
+
+        text = clean_text(result.text)
+        if not text:
+            return None, "No text could be extracted (empty file or unreadable scan)."
+        return resume_nlp.extract_profile(text, budget=self.budget), None
+
+    def _process(self, name: str) -> None:
+        src = os.path.join(self.dirs["incoming"], name)
+        t0 = time.perf_counter()
+        try:
+            try:
+                profile, error = self._extract(src, name)
+            except Exception as e:
+                profile, error = None, f"{type(e).__name__}: {e}"
+            seconds = round(time.perf_counter() - t0, 3)
+
+            # result first, then move: a crash in between only means the
+            # file is parsed again on restart
+            if error is None:
+                out_name = _unique_name(self.dirs["processed"], name)
+                write_json_atomic(
+                    os.path.join(self.dirs["results"], out_name + ".json"),
+                    {"source": name, "ingested_at": _now_iso(), "seconds": seconds, "profile": profile},
+                )
+                os.replace(src, os.path.join(self.dirs["processed"], out_name))
+                print(f"✅ {name} ({seconds:.2f}s)")
+            else:
+                out_name = _unique_name(self.dirs["failed"], name)
+                write_json_atomic(
+                    os.path.join(self.dirs["failed"], out_name + ".error.json"),
+                    {"source": name, "failed_at": _now_iso(), "seconds": seconds, "error": error},
+                )
+                os.replace(src, os.path.join(self.dirs["failed"], out_name))
+                print(f"❌ {name}: {error}")
+        except Exception as e:
+            # e.g. the partner removed the file mid-way, or it cannot be moved
+            # out of incoming/; either way it is not retried while unchanged
+            error = f"{type(e).__name__}: {e}"
+            self._mark_stuck(name, src)
+            print(f"❌ {name}: {error}")
+        finally:
+            self._finish(name, error, time.perf_counter() - t0)
+
+    def _mark_stuck(self, name: str, src: str) -> None:
+        try:
+            st = os.stat(src)
+        except OSError:
+            return  # already gone
+        with self._lock:
+            self._stuck[name] = (st.st_size, st.st_mtime_ns)
+
+    def _finish(self, name: str, error, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._inflight.discard(name)
+            if error is None:
+                self.processed += 1
+            else:
+                self.failed += 1
+                self.last_error = {"file": name, "error": error, "at": _now_iso()}
+            self._finished.append(now)
+            while self._finished and self._finished[0] < now - 300:
+                self._finished.popleft()
+            self._durations.append(seconds)
+        self._wake.set()  # a worker slot is free
+
+    # -----------------------------
+    # Status
+    # -----------------------------
+    def status(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            last_minute = sum(1 for t in self._finished if t >= now - 60)
+            last_5_minutes = sum(1 for t in self._finished if t >= now - 300)
+            durations = list(self._durations)
+            return {
+                "started_at": self.started_at,
+                "updated_at": _now_iso(),
+                "watcher": self.watcher,
+                "workers": self.workers,
+                "backlog": self.backlog,
+                "in_flight": len(self._inflight),
+                "stuck": sorted(self._stuck),
+                "processed": self.processed,
+                "failed": self.failed,
+                "throughput_per_minute": {"last_1m": last_minute, "last_5m_avg": round(last_5_minutes / 5, 1)},
+                "avg_seconds_per_file": round(sum(durations) / len(durations), 3) if durations else None,
+                "last_error": self.last_error,
+            }
+
+    def write_status(self) -> None:
+        write_json_atomic(self.status_path, self.status())
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Watch a spool directory and parse dropped resumes.")
+    ap.add_argument("spool", help="spool directory (incoming/, results/, processed/, failed/ are created)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="extractor processes / files in flight")
+    ap.add_argument("--settle", type=float, default=2.0, help="seconds a file must be unchanged before it is read")
+    ap.add_argument("--poll", type=float, default=2.0, help="polling interval when watchdog is not installed")
+    ap.add_argument("--timeout", type=float, default=60.0, help="per-file extraction timeout in seconds")
+    ap.add_argument("--once", action="store_true", help="exit when incoming/ is empty")
+    args = ap.parse_args()
+
+    daemon = IngestDaemon(args.spool, workers=args.workers, settle=args.settle, poll=args.poll, timeout=args.timeout)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Split multi-resume PDF bundles (campus drives) into one profile per candidate.
+
+utils.extract_pdf_text joins every page, so a 500-page bundle would become a
+single profile. This streams the bundle instead:
+
+  1. page text is extracted in chunks of pages by a process pool, a few
+     chunks ahead of the reader (only those chunks are held in memory)
+  2. each page is checked for the start of a new resume (see _page_starts_new)
+  3. every finished candidate goes straight to extract_profile in the same
+     pool, with a bounded number of parse jobs in flight
+
+Boundaries are placed at page starts: bundles put each resume on a new page.
+
+  python pdf_split.py bundle.pdf                      # JSONL profiles to stdout
+  python pdf_split.py bundle.pdf --out bundle.jsonl --workers 8
+  python pdf_split.py bundle.pdf --pages-only         # just the page ranges
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import pdfplumber
+
+import resume_nlp
+from utils import clean_text
+
+# contacts only count at the top of a page (a referee's email further down
+# must not start a new candidate)
+PAGE_HEAD_CHARS = 600
+CHUNK_PAGES = 8
+
+_KNOWN_HEADERS = {h.lower() for h in resume_nlp.SECTION_HEADERS}
+
+
+@dataclass
+class Candidate:
+    index: int
+    first_page: int  # 1-based, inclusive
+    last_page: int
+    text: str
+
+
+@dataclass
+class _Signals:
+    emails: Set[str]
+    phones: Set[str]
+    sections: Set[str]
+    name_line: bool
+
+
+@dataclass
+class _Current:
+    first_page: int
+    pages: List[str] = field(default_factory=list)
+    emails: Set[str] = field(default_factory=set)
+    phones: Set[str] = field(default_factory=set)
+    sections: Set[str] = field(default_factory=set)
+
+
+# -----------------------------
+# Page text (worker processes)
+# -----------------------------
+def _extract_pages(path: str, start: int, stop: int) -> List[str]:
+    texts = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:stop]:
+            texts.append(clean_text(page.extract_text() or ""))
+            page.close()  # drop pdfminer layout caches
+    return texts
+
+
+def page_count(path: str) -> int:
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_page_texts(path: str, pool: Optional[ProcessPoolExecutor] = None, prefetch: int = 2) -> Iterator[str]:
+    """Page texts in order; with a pool, `prefetch` chunks are extracted ahead."""
+    total = page_count(path)
+    ranges = deque((s, min(s + CHUNK_PAGES, total)) for s in range(0, total, CHUNK_PAGES))
+
+    if pool is None:
+        for start, stop in ranges:
+            yield from _extract_pages(path, start, stop)
+        return
+
+    pending = deque()
+    while ranges or pending:
+        while ranges and len(pending) < max(1, prefetch):
+            pending.append(pool.submit(_extract_pages, path, *ranges.popleft()))
+        yield from pending.popleft().result()
+
+
+# -----------------------------
+# Boundary detection
+# -----------------------------
+def _is_name_line(line: str) -> bool:
+    if "@" in line or re.search(r"\d", line):
+        return False
+    cleaned = re.sub(r"\s+", " ", re.sub(r"[^A-Za-z .'-]", "", line)).strip()
+    if cleaned.lower().strip(":") in _KNOWN_HEADERS:
+        return False
+    return 2 <= len(cleaned.split()) <= 5
+
+
+def _page_signals(text: str) -> _Signals:
+    head = text[:resume_nlp.contact_head_end(text, PAGE_HEAD_CHARS)]
+    contacts = resume_nlp.extract_contacts(head, head_chars=len(head))
+    phone, _ = resume_nlp.best_phone(contacts)
+
+    first_line = next((ln for ln in head.split("\n") if ln.strip()), "")
+    sections = set(resume_nlp.split_sections(text)) - {"__top__"}
+    return _Signals(
+        emails={c["value"].lower() for c in contacts["email"]},
+        phones={re.sub(r"\D", "", phone)[-10:]} if phone else set(),
+        sections=sections,
+        name_line=_is_name_line(first_line),
+    )
+
+
+def _page_starts_new(current: _Current, sig: _Signals) -> bool:
+    """
+    Two of three signals are needed, so one odd page (a projects page that
+    happens to start with two words, a referee's email) does not split:
+      - an email/phone in the page head that this candidate has not shown yet
+      - a name-like first line
+      - section headers starting over (e.g. a second "Education")
+    """
+    new_contact = bool(sig.emails - current.emails) or bool(sig.phones - current.phones)
+    restart = bool(sig.sections & current.sections)
+    return new_contact + restart + sig.name_line >= 2
+
+
+def iter_candidates(pages: Iterable[str]) -> Iterator[Candidate]:
+    """Groups page texts into per-candidate documents."""
+    current: Optional[_Current] = None
+    index = 0
+
+    for page_no, text in enumerate(pages, start=1):
+        if not text.strip():
+            if current is not None:
+                current.pages.append(text)
+            continue
+
+        sig = _page_signals(text)
+        if current is None or _page_starts_new(current, sig):
+            if current is not None and current.pages:
+                yield Candidate(index, current.first_page, page_no - 1, "\n\n".join(current.pages))
+                index += 1
+            current = _Current(first_page=page_no)
+
+        current.pages.append(text)
+        current.emails |= sig.emails
+        current.phones |= sig.phones
+        current.sections |= sig.sections
+
+    if current is not None and current.pages:
+        yield Candidate(index, current.first_page, current.first_page + len(current.pages) - 1,
+                        "\n\n".join(current.pages))
+
+
+# -----------------------------
+# Split + parse
+# -----------------------------
+def _parse_candidate(candidate: Candidate, budget: Optional[Dict[str, int]]) -> Dict:
+    return {
+        "index": candidate.index,
+        "pages": [candidate.first_page, candidate.last_page],
+        "profile": resume_nlp.extract_profile(candidate.text, budget=budget),
+    }
+
+
+def split_and_parse(
+    path: str,
+    workers: Optional[int] = None,
+    budget: Optional[Dict[str, int]] = resume_nlp.DEFAULT_BUDGET,
+) -> Iterator[Dict]:
+    """
+    Yields {"index", "pages": [first, last], "profile"} per candidate, in
+    completion order (sort by "index" for bundle order).
+    """
+    workers = workers or os.cpu_count() or 2
+    max_parse_jobs = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsing = set()
+        for candidate in iter_candidates(iter_page_texts(path, pool, prefetch=workers)):
+            parsing.add(pool.submit(_parse_candidate, candidate, budget))
+            if len(parsing) >= max_parse_jobs:
+                done, parsing = wait(parsing, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+
+        for fut in wait(parsing).done:
+            yield fut.result()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Split a multi-resume PDF into per-candidate profiles.")
+    ap.add_argument("pdf")
+    ap.add_argument("--out", help="JSONL output file (default: stdout)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--pages-only", action="store_true", help="print page ranges without parsing")
+    args = ap.parse_args()
+
+    if args.pages_only:
+        for c in iter_candidates(iter_page_texts(args.pdf)):
+            print(f"{c.index + 1:>4}: pages {c.first_page}-{c.last_page}  {c.text.split(chr(10), 1)[0][:60]}")
+        return
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    count = 0
+    try:
+        for record in split_and_parse(args.pdf, workers=args.workers):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if args.out:
+            out.close()
+            print(f"✅ {count} candidates -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
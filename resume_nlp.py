@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Tuple
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
 
 # Optional spaCy (safe fallback if not installed)
 try:
@@ -20,6 +21,33 @@ EMAIL_RE = re.compile(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", re.I)
 # Loose phone regex; validate by digit count later
 PHONE_RE = re.compile(r"(\+?\d[\d\s().-]{7,}\d)")
 
+# One-pass contact scanner (see extract_contacts). Digit runs come from one
+# regex that starts with a plain character class (so `re` can skip ordinary
+# text fast) and are classified as phone / pincode in Python; emails and
+# profile links are anchored on "@" / "linkedin.com/" / "github.com/" with
+# str.find instead of patterns tried at every position.
+CONTACT_NUMBER_RE = re.compile(r"[+\d][\d\s().+-]{4,}\d")
+# a run holding two numbers ("+91 98765 43210 +91 91234 56789") splits here
+_NUMBER_SPLIT_RE = re.compile(r"\s+(?=\+\d)")
+PINCODE_RE = re.compile(r"[1-9]\d{2}\s?\d{3}")
+CONTACT_LINK_MARKERS = (("linkedin", "linkedin.com/"), ("github", "github.com/"))
+_TOKEN_STOP = frozenset(" \t\n|,;()<>\"'")
+
+# How much of the document counts as "top" for contact details
+CONTACT_HEAD_CHARS = 1000
+PHONE_MIN_SCORE = 0.6
+
+PHONE_LABEL_WORDS = ("phone", "mobile", "mob", "tel", "ph", "contact", "whatsapp", "cell")
+PHONE_LABEL_RE = re.compile(r"\b(" + "|".join(PHONE_LABEL_WORDS) + r")\b", re.I)
+# last word before an unlabeled number that makes it an ID, not a phone
+ID_LABEL_WORDS = frozenset({
+    "id", "ref", "no", "number", "ticket", "roll", "reg", "registration", "application", "order",
+    "invoice", "account", "acc", "aadhaar", "aadhar", "pan", "usn", "enrollment", "enrolment", "passport",
+})
+YEAR_RANGE_RE = re.compile(r"\b(19|20)\d{2}\b.*\b(19|20)\d{2}\b")
+# "2021-04-118877": starts like a date
+DATE_PREFIX_RE = re.compile(r"(19|20)\d{2}[-/.]\d{1,2}(?:[-/.]|$)")
+
 DEGREE_KEYWORDS = [
     "b.tech", "btech", "b.e", "be", "b.sc", "bsc", "bca",
     "mba", "m.tech", "mtech", "m.sc", "msc", "mca",
@@ -102,6 +130,23 @@ SECTION_HEADERS = [
     "certifications", "certificates",
 ]
 
+# Budget mode: hard caps so huge pasted inputs (portfolios, logs) cost a
+# bounded amount of work. Pass (a subset of) this to extract_profile(budget=...).
+DEFAULT_BUDGET: Dict[str, int] = {
+    "max_chars": 50000,          # characters of the document analyzed at all
+    "max_header_lines": 1500,    # stop header detection after this many lines
+    "max_section_lines": 300,    # lines kept per section
+    "max_section_chars": 12000,  # characters kept per section
+}
+
+# which profile fields read which section (used to report truncation)
+_SECTION_FIELDS: Dict[str, List[str]] = {
+    "__top__": ["full_name", "employment"],
+    "skills": ["skills"],
+    "education": ["education"],
+    "experience": ["employment", "experience_details"],
+}
+
 
 # -----------------------------
 # Helpers
@@ -115,47 +160,344 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
+def _resolve_budget(budget: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """None -> no limits; otherwise DEFAULT_BUDGET overridden by the given keys."""
+    if budget is None:
+        return {}
+    return {**DEFAULT_BUDGET, **budget}
+
+
+def _truncated_fields(doc_cut: bool, cut_sections: List[str], sections: Dict[str, str]) -> List[str]:
+    fields: List[str] = []
+    for name in cut_sections:
+        fields.extend(_SECTION_FIELDS.get(name, []))
+
+    # fields that fall back to (or always read) the whole document
+    whole_doc: List[str] = []
+    if doc_cut:
+        whole_doc += ["email", "phone"]
+    if doc_cut or "__headers__" in cut_sections:
+        if not sections.get("skills"):
+            whole_doc.append("skills")
+        if not sections.get("education"):
+            whole_doc.append("education")
+    if "__headers__" in cut_sections and not sections.get("experience"):
+        whole_doc += ["employment", "experience_details"]
+    fields.extend(whole_doc)
+
+    return sorted(set(fields))
+
+
 def _digits_only(s: str) -> str:
     return re.sub(r"\D", "", s)
 
 
-def find_email(text: str) -> Tuple[str, float]:
-    m = EMAIL_RE.search(text)
-    if not m:
+_DROP_DIGITS = str.maketrans("", "", "0123456789")
+
+
+def _digit_count(s: str) -> int:
+    return len(s) - len(s.translate(_DROP_DIGITS))
+
+
+def _token_bounds(text: str, i: int, lo: int, hi: int) -> Tuple[int, int]:
+    """Whitespace/separator-delimited token around position i, within [lo, hi)."""
+    a = i
+    while a > lo and text[a - 1] not in _TOKEN_STOP:
+        a -= 1
+    b = i
+    while b < hi and text[b] not in _TOKEN_STOP:
+        b += 1
+    return a, b
+
+
+def _phone_labeled(value: str, label: str) -> bool:
+    return value.startswith("+") or PHONE_LABEL_RE.search(label) is not None
+
+
+def _id_labeled(label: str) -> bool:
+    """ "Ref no.", "Application ID:", "ticket" right before the number."""
+    word = label.rstrip(" \t.:#-").rpartition(" ")[2].lstrip("([{|/#")
+    return word.lower() in ID_LABEL_WORDS
+
+
+def _score_phone(value: str, label: str, labeled: bool, in_head: bool) -> float:
+    n = _digit_count(value)
+    if n in (10, 12, 13):
+        score = 0.92
+    elif n in (9, 11):
+        score = 0.85
+    else:
+        score = 0.55   # 14-15 digits: long international formats / extensions
+    if labeled:
+        score += 0.04
+    else:
+        # a bare digit run is often an ID; any labeled / "+" number outranks it
+        score -= 0.15
+        if _id_labeled(label):
+            score -= 0.4
+    if YEAR_RANGE_RE.search(value) or DATE_PREFIX_RE.match(value):
+        score -= 0.4   # "2019 - 2023" / "2021-04-118877" style date runs
+    if not in_head:
+        score -= 0.08
+    return round(max(0.0, min(score, 0.99)), 2)
+
+
+def _score_contact(kind: str, value: str, label: str, in_head: bool) -> float:
+    """label: the text just before the candidate on its line (phones/pincodes)."""
+    if kind == "phone":
+        return _score_phone(value, label, _phone_labeled(value, label), in_head)
+    if kind == "email":
+        score = 0.98
+    elif kind in ("linkedin", "github"):
+        score = 0.95
+    else:
+        score = 0.8 if re.search(r"\b(pin|pincode|india)\b", label, re.I) else 0.6
+    if not in_head:
+        score -= 0.08
+    return round(max(0.0, min(score, 0.99)), 2)
+
+
+def _label_before(text: str, pos: int) -> str:
+    line_start = text.rfind("\n", 0, pos) + 1
+    return text[max(line_start, pos - 30):pos]
+
+
+def _run_parts(text: str, run: str, pos: int) -> List[Tuple[str, int]]:
+    """(value, pos) of the numbers in one digit run, split where it holds two."""
+    if "+" not in run:
+        return [(run, pos)]
+    parts = []
+    for part in _NUMBER_SPLIT_RE.split(run):
+        value, at = part, pos + run.find(part)
+        # drop a stray leading "+" that is not a country code ("C++ 98765...")
+        while value.startswith("+") and not value[1:2].isdigit():
+            value = value[1:].lstrip()
+            at = text.find(value, at)
+        parts.append((value, at))
+    return parts
+
+
+def _phone_candidate(value: str, pos: int, label: str, labeled: bool, in_head: bool) -> Dict:
+    if "+" in value:
+        # normalize odd formats like "91+ 784274592" -> "+91 784274592"
+        value = re.sub(r"^(\d{1,3})\+\s*", r"+\1 ", value)
+    return {"value": value, "score": _score_phone(value, label, labeled, in_head), "pos": pos, "labeled": labeled}
+
+
+def _label_spans(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """(start, end) of every phone label word in text[start:end], in order (str.find, no regex pass)."""
+    low = text[start:end].lower()
+    spans = []
+    for word in PHONE_LABEL_WORDS:
+        i = low.find(word)
+        while i != -1:
+            j = i + len(word)
+            before = low[i - 1] if i else " "
+            after = low[j] if j < len(low) else " "
+            if not (before.isalnum() or before == "_" or after.isalnum() or after == "_"):
+                spans.append((start + i, start + j))
+            i = low.find(word, j)
+    spans.sort()
+    return spans
+
+
+# best score a body phone with n digits can reach (labeled, no penalty)
+_BODY_PHONE_CEILING = {n: round((0.92 if n in (10, 12, 13) else 0.85) + 0.04 - 0.08, 2) for n in range(9, 14)}
+
+
+def _body_phones(text: str, start: int, end: int, labeled_only: bool) -> List[Dict]:
+    """
+    Phone candidates past the top. Only the ones that can still become the
+    best_phone pick are kept (usable, and better than every earlier one).
+    Runs that cannot win are dropped after a digit count, date-like runs
+    before their label is read, and label words are located once with
+    str.find, so a long body full of dates and IDs stays cheap.
+    """
+    spans = _label_spans(text, start, end)
+    if labeled_only and not spans and text.find("+", start, end) == -1:
+        return []
+    span_starts = [a for a, _b in spans]
+
+    kept: List[Dict] = []
+    best = (0.0, 0)  # (score, digits) of the last kept candidate
+    for m in CONTACT_NUMBER_RE.finditer(text, start, end):
+        run = m.group(0)
+        if len(run) < 9:
+            continue
+        for value, pos in _run_parts(text, run, m.start()):
+            n = len(value) - len(value.translate(_DROP_DIGITS))
+            if not 9 <= n <= 13 or (_BODY_PHONE_CEILING[n], n) <= best:
+                continue
+            if DATE_PREFIX_RE.match(value) or YEAR_RANGE_RE.search(value):
+                continue
+            label_start = max(text.rfind("\n", 0, pos) + 1, pos - 30)
+            k = bisect_left(span_starts, label_start)
+            labeled = value.startswith("+") or (k < len(spans) and spans[k][1] <= pos)
+            label = text[label_start:pos]
+            # an unlabeled number after "ID" / "Ref no." scores below PHONE_MIN_SCORE
+            if not labeled and (labeled_only or _id_labeled(label)):
+                continue
+            cand = _phone_candidate(value, pos, label, labeled, False)
+            if cand["score"] >= PHONE_MIN_SCORE and (cand["score"], n) > best:
+                kept.append(cand)
+                best = (cand["score"], n)
+    return kept
+
+
+def contact_head_end(text: str, head_chars: int = CONTACT_HEAD_CHARS) -> int:
+    """End of the "top of the document" region (cut at a line break)."""
+    if len(text) <= head_chars:
+        return len(text)
+    nl = text.find("\n", head_chars)
+    return nl if nl != -1 else len(text)
+
+
+def extract_contacts(text: str, head_chars: int = CONTACT_HEAD_CHARS) -> Dict[str, List[Dict]]:
+    """
+    Single-pass contact scanner.
+    Scans the top of the document once; the rest is only scanned for what the
+    top lacks (see contact_body_kinds). Returns every candidate with a score:
+      {"email": [...], "phone": [...], "linkedin": [...], "github": [...], "pincode": [...]}
+    where each candidate is {"value", "score", "pos"}, best first; phones also
+    carry "labeled" (a "+" prefix or a phone/mobile label before them). Past
+    the top, only phones that can still be best_phone's pick are kept.
+    """
+    found: Dict[str, List[Dict]] = {k: [] for k in ("email", "phone", "linkedin", "github", "pincode")}
+    head_end = contact_head_end(text, head_chars)
+
+    def add(kind: str, value: str, pos: int, in_head: bool) -> None:
+        label = _label_before(text, pos) if kind == "pincode" else ""
+        found[kind].append({"value": value, "score": _score_contact(kind, value, label, in_head), "pos": pos})
+
+    def scan(start: int, end: int, in_head: bool, kinds) -> None:
+        if "phone" in kinds or "pincode" in kinds:
+            for m in CONTACT_NUMBER_RE.finditer(text, start, end):
+                for value, pos in _run_parts(text, m.group(0), m.start()):
+                    n = _digit_count(value)
+                    if 9 <= n <= 15 and "phone" in kinds:
+                        label = _label_before(text, pos)
+                        labeled = _phone_labeled(value, label)
+                        found["phone"].append(_phone_candidate(value, pos, label, labeled, in_head))
+                    elif n == 6 and "pincode" in kinds and PINCODE_RE.fullmatch(value):
+                        if pos == 0 or not text[pos - 1].isalnum():
+                            add("pincode", value, pos, in_head)
+
+        if "email" in kinds:
+            i = text.find("@", start, end)
+            while i != -1:
+                tok_start, tok_end = _token_bounds(text, i, start, end)
+                m = EMAIL_RE.search(text, tok_start, tok_end)
+                if m:
+                    add("email", m.group(0), m.start(), in_head)
+                i = text.find("@", tok_end, end)
+
+        if not any(kind in kinds for kind, _marker in CONTACT_LINK_MARKERS):
+            return
+        low = text[start:end].lower()
+        for kind, marker in CONTACT_LINK_MARKERS:
+            if kind not in kinds:
+                continue
+            i = low.find(marker)
+            while i != -1:
+                tok_start, tok_end = _token_bounds(text, start + i, start, end)
+                value = text[tok_start:tok_end].rstrip(".")
+                if tok_end > start + i + len(marker):
+                    add(kind, value, tok_start, in_head)
+                i = low.find(marker, tok_end - start)
+
+    scan(0, head_end, True, set(found))
+
+    # only go past the top for what is still missing
+    missing = contact_body_kinds(found)
+    if head_end < len(text) and missing:
+        scan(head_end, len(text), False, missing - {"phone", "labeled_phone"})
+        if missing & {"phone", "labeled_phone"}:
+            found["phone"] += _body_phones(text, head_end, len(text), "phone" not in missing)
+
+    for kind in found:
+        found[kind].sort(key=lambda c: (-c["score"], c["pos"]))
+    return found
+
+
+def usable_phone(candidate: Dict) -> bool:
+    # accept 9-13 digits (covers cases like missing one digit in fake data too),
+    # skipping candidates that scored like date runs
+    return 9 <= _digit_count(candidate["value"]) <= 13 and candidate["score"] >= PHONE_MIN_SCORE
+
+
+def contact_body_kinds(contacts: Dict[str, List[Dict]], head_end: Optional[int] = None) -> set:
+    """
+    What extract_contacts looks for past the top, given the candidates found
+    before head_end (default: all of them): an email if there is none, any
+    phone if none is usable (best_phone would reject them all), or only
+    labeled / "+" phones if the usable ones are bare digit runs, since a
+    labeled phone further down outranks those.
+    """
+    def in_head(kind: str) -> List[Dict]:
+        return [c for c in contacts[kind] if head_end is None or c["pos"] < head_end]
+
+    kinds = set()
+    if not in_head("email"):
+        kinds.add("email")
+    phones = [c for c in in_head("phone") if usable_phone(c)]
+    if not phones:
+        kinds.add("phone")
+    elif not any(c["labeled"] for c in phones):
+        kinds.add("labeled_phone")
+    return kinds
+
+
+def best_email(contacts: Dict[str, List[Dict]]) -> Tuple[str, float]:
+    if not contacts["email"]:
         return "", 0.0
-    return m.group(0), 0.98
+    # first email in document order (what the old full-text search returned)
+    first = min(contacts["email"], key=lambda c: c["pos"])
+    return first["value"], 0.98
 
 
-def find_phone(text: str) -> Tuple[str, float]:
-    # normalize odd formats like "91+ 784274592" -> "+91 784274592"
-    text = re.sub(r"\b(\d{1,3})\+\s*", r"+\1 ", text)
-
-    candidates = PHONE_RE.findall(text)
-    best = ""
-    best_len = 0
-
-    for c in candidates:
-        digits = _digits_only(c)
-        # accept 9-13 digits (covers cases like missing one digit in fake data too)
-        if 9 <= len(digits) <= 13:
-            if len(digits) > best_len:
-                best = c.strip()
-                best_len = len(digits)
-
-    if not best:
+def best_phone(contacts: Dict[str, List[Dict]]) -> Tuple[str, float]:
+    usable = [c for c in contacts["phone"] if usable_phone(c)]
+    if not usable:
         return "", 0.0
 
+    best = max(usable, key=lambda c: (c["score"], _digit_count(c["value"]), -c["pos"]))
+    best_len = _digit_count(best["value"])
     conf = 0.92 if best_len in (10, 12, 13) else 0.85
-    return best, conf
+    return best["value"], conf
+
+
+def find_email(text: str) -> Tuple[str, float]:
+    return best_email(extract_contacts(text))
+
+
+def find_phone(text: str) -> Tuple[str, float]:
+    return best_phone(extract_contacts(text))
 
 
-def split_sections(text: str) -> Dict[str, str]:
+def split_sections(text: str, budget: Optional[Dict[str, int]] = None) -> Dict[str, str]:
     """
     Simple section splitter using known headers.
     Returns: header -> content. Includes "__top__".
+    Pass a budget (see DEFAULT_BUDGET) to cap the work done on huge inputs.
     """
-    lines = [ln.strip() for ln in text.split("\n")]
+    sections, _truncated = _split_sections(text, budget)
+    return sections
+
+
+def _split_sections(text: str, budget: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Budget-aware worker behind split_sections.
+    Returns (sections, truncated) where truncated lists the section names that
+    were cut, plus "__headers__" if header detection stopped early.
+    """
+    limits = _resolve_budget(budget)
+    max_header_lines = limits.get("max_header_lines")
+    max_section_lines = limits.get("max_section_lines")
+    max_section_chars = limits.get("max_section_chars")
+
     sections: Dict[str, List[str]] = {"__top__": []}
+    sizes: Dict[str, int] = {"__top__": 0}
+    truncated: List[str] = []
     current = "__top__"
 
     header_re = re.compile(r"^[A-Za-z][A-Za-z &/]{2,40}$")
@@ -172,61 +514,90 @@ def split_sections(text: str) -> Dict[str, str]:
         h = h.lower().strip(":").strip()
         return header_map.get(h, h)
 
+    def mark(name: str) -> None:
+        if name not in truncated:
+            truncated.append(name)
+
+    def is_full(name: str) -> bool:
+        if max_section_lines is not None and len(sections[name]) >= max_section_lines:
+            return True
+        if max_section_chars is not None and sizes[name] >= max_section_chars:
+            return True
+        return False
+
     known = set([canon(h) for h in SECTION_HEADERS])
+    seen_lines = 0
 
-    for ln in lines:
+    for ln in text.split("\n"):
+        ln = ln.strip()
         if not ln:
             continue
+        seen_lines += 1
+
+        detect_headers = max_header_lines is None or seen_lines <= max_header_lines
+        if not detect_headers:
+            mark("__headers__")
+
+        if detect_headers and header_re.match(ln):
+            low = canon(ln)
+            if low in known:
+                current = low
+                sections.setdefault(current, [])
+                sizes.setdefault(current, 0)
+                continue
 
-        low = canon(ln)
-        if header_re.match(ln) and low in known:
-            current = low
-            sections.setdefault(current, [])
+        if is_full(current):
+            mark(current)
+            # no header can open a new section any more -> nothing left to do
+            if not detect_headers:
+                break
             continue
 
-        sections.setdefault(current, []).append(ln)
+        if max_section_chars is not None and sizes[current] + len(ln) > max_section_chars:
+            ln = ln[: max_section_chars - sizes[current]]
+            mark(current)
 
-    return {k: "\n".join(v).strip() for k, v in sections.items()}
+        sections[current].append(ln)
+        sizes[current] += len(ln) + 1
+
+    return {k: "\n".join(v).strip() for k, v in sections.items()}, truncated
 
 
 # -----------------------------
 # NEW: Skills cleaning filter (prevents junk in Resume 3 & 5)
 # -----------------------------
-def clean_skill(token: str) -> bool:
+def skill_rejection_reason(token: str) -> Optional[str]:
+    """Name of the first rule that rejects token, or None if it is kept."""
     token = token.strip()
     if not token:
-        return False
+        return "empty"
 
     low = token.lower()
 
     # ❌ reject pure numbers
     if token.isdigit():
-        return False
+        return "number"
 
     # ❌ reject years
     if re.search(r"\b(19|20)\d{2}\b", token):
-        return False
+        return "year"
 
     # ❌ reject labels
     if ":" in token:
-        return False
+        return "label"
 
     # ❌ reject long phrases
     if len(token.split()) > 4:
-        return False
+        return "long_phrase"
 
     # ✅ NEW: reject separator lines like _________ or ----- or =====
     if re.fullmatch(r"[_=\-]{3,}", token):
-        return False
+        return "separator"
 
     # ✅ NEW: reject tokens that are mostly underscores/dashes
     if len(token) >= 10 and (_digits_only(token) == "" and token.count("_") / len(token) > 0.6):
-        return False
+        return "underscores"
 
-    # ❌ reject pure numbers
-    if token.isdigit():
-        return False 
-    
     # ❌ reject generic non-skill words
     reject_exact = {
         "learning",
@@ -237,7 +608,7 @@ def clean_skill(token: str) -> bool:
         "leadership"
     }
     if low in reject_exact:
-        return False
+        return "generic_word"
 
     # ❌ reject non-skill academic / activity phrases
     reject_contains = [
@@ -258,11 +629,11 @@ def clean_skill(token: str) -> bool:
         "cloud platform"   # removes "AWS Cloud Platform"
     ]
     if any(p in low for p in reject_contains):
-        return False
+        return "non_skill_phrase"
 
     # ❌ reject combined phrases like "Git & GitHub"
     if "&" in token:
-        return False
+        return "combined_phrase"
 
     # ❌ remove likely names unless known tech phrase
     if re.fullmatch(r"[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+", token):
@@ -273,12 +644,21 @@ def clean_skill(token: str) -> bool:
             "Statistics for Data Science"
         }
         if token not in allowed:
-            return False
+            return "likely_name"
+
+    return None
 
-    return True
+
+def clean_skill(token: str) -> bool:
+    return skill_rejection_reason(token) is None
 
 
-def extract_skills(text: str, sections: Dict[str, str]) -> Tuple[List[str], float]:
+def extract_skills(text: str, sections: Dict[str, str], trace: Optional[List[Dict]] = None) -> Tuple[List[str], float]:
+    """
+    trace: optional list; every skills-section token is appended to it as
+    {"raw", "token", "rule", "canonical"} (rule None = accepted, canonical
+    None = not in SKILL_CANONICAL). Used by skill_mining.py.
+    """
     raw = sections.get("skills", "")
     haystack = (raw if raw else text).lower()
 
@@ -295,7 +675,10 @@ def extract_skills(text: str, sections: Dict[str, str]) -> Tuple[List[str], floa
             tt = re.sub(r"[_=\-]{3,}", "", tt).strip()
             tt = tt.strip(" ,.;:_-")
 
-            if not clean_skill(tt):
+            rule = skill_rejection_reason(tt)
+            if trace is not None:
+                trace.append({"raw": t, "token": tt, "rule": rule, "canonical": SKILL_CANONICAL.get(tt.lower())})
+            if rule is not None:
                 continue
 
             # normalize if known, else keep as-is
@@ -577,23 +960,61 @@ def build_warnings(profile: Dict) -> List[str]:
 # -----------------------------
 # Public API
 # -----------------------------
-def extract_profile(resume_text: str) -> Dict:
+def prepare_text(resume_text: str, budget: Optional[Dict[str, int]] = None) -> Tuple[str, Dict[str, str], Optional[List[str]]]:
+    """
+    Normalize + split, honouring the budget.
+    Returns (text, sections, truncated) - truncated is None without a budget.
+    """
+    limits = _resolve_budget(budget)
+    max_chars = limits.get("max_chars")
+    doc_cut = max_chars is not None and len(resume_text) > max_chars
+    if doc_cut:
+        resume_text = resume_text[:max_chars]
+
+    text = normalize_text(resume_text)
+    sections, cut_sections = _split_sections(text, budget)
+
+    truncated = _truncated_fields(doc_cut, cut_sections, sections) if budget is not None else None
+    return text, sections, truncated
+
+
+def extract_profile(resume_text: str, budget: Optional[Dict[str, int]] = None) -> Dict:
     """
     Input: raw resume text (already OCR'ed or extracted from PDF)
     Output: stable JSON for DEET-style auto-fill
+
+    budget: optional caps (see DEFAULT_BUDGET). When given, the output also
+    carries "truncated": the fields computed from cut-down input.
     """
-    text = normalize_text(resume_text)
-    sections = split_sections(text)
+    text, sections, truncated = prepare_text(resume_text, budget)
+
+    contacts = extract_contacts(text)
+    fields = {
+        "email": best_email(contacts),
+        "phone": best_phone(contacts),
+        "skills": extract_skills(text, sections),
+        "education": extract_education(text, sections),
+        "employment": extract_employment(text, sections),
+        "full_name": extract_name(text, sections),
+
+        # ✅ NEW: structured experience extraction (role/company/tenure)
+        "experience_details": extract_experience_details(text, sections),
+    }
+    return assemble_profile(fields, truncated)
 
-    email, c_email = find_email(text)
-    phone, c_phone = find_phone(text)
-    skills, c_skills = extract_skills(text, sections)
-    education, c_edu = extract_education(text, sections)
-    employment, c_emp = extract_employment(text, sections)
-    name, c_name = extract_name(text, sections)
 
-    # ✅ NEW: structured experience extraction (role/company/tenure)
-    experience_details, c_exp_details = extract_experience_details(text, sections)
+def assemble_profile(fields: Dict[str, Tuple], truncated: Optional[List[str]] = None) -> Dict:
+    """
+    Builds the output JSON from per-field (value, confidence) results:
+    full_name, email, phone, education, employment, skills, experience_details.
+    """
+    name, c_name = fields["full_name"]
+    email, c_email = fields["email"]
+    phone, c_phone = fields["phone"]
+    education, c_edu = fields["education"]
+    employment, c_emp = fields["employment"]
+    skills, c_skills = fields["skills"]
+    experience_details, c_exp_details = fields["experience_details"]
 
     profile = {
         "personal": {
@@ -622,6 +1043,9 @@ def extract_profile(resume_text: str) -> Dict:
         "warnings": []
     }
 
+    if truncated is not None:
+        profile["truncated"] = truncated
+
     # warnings
     profile["warnings"] = build_warnings(profile)
 
@@ -0,0 +1,413 @@
+# semantic_index.py
+"""
+Offline semantic matching for skills and jobs.
+
+- Vectors: hashed character n-gram embeddings (CPU only, no model download).
+  "PySpark" / "Apache Spark" or "scikit learn" / "scikit-learn" share most
+  of their n-grams, so they land close together without hand-added aliases.
+- Index: IVF (k-means buckets) stored as plain .npy files and memory-mapped
+  at query time, so a 1M-vector catalog opens instantly and a query only
+  touches `nprobe` buckets (a few thousand vectors).
+
+CLI:
+  python semantic_index.py build-skills indexes/skills [--extra more_skills.txt]
+  python semantic_index.py build-jobs indexes/jobs jobs.jsonl
+  python semantic_index.py similar-skills indexes/skills "pyspark"
+  python semantic_index.py similar-jobs indexes/jobs outputs/resume1.json
+  python semantic_index.py bench --n 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_nlp import SKILL_CANONICAL
+
+DIM = 256
+NGRAMS = (2, 3, 4)
+
+
+# -----------------------------
+# Hashed n-gram embeddings
+# -----------------------------
+def _normalize(text: str) -> str:
+    text = text.lower().replace(".js", "js")
+    text = re.sub(r"[^a-z0-9+#]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+@lru_cache(maxsize=200000)
+def _slot(gram: str, dim: int) -> Tuple[int, float]:
+    h = zlib.crc32(gram.encode("utf-8"))
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+def embed(text: str, dim: int = DIM) -> np.ndarray:
+    """L2-normalized float32 vector for a skill name or a longer text."""
+    vec = np.zeros(dim, dtype=np.float32)
+    norm = _normalize(text)
+    if not norm:
+        return vec
+
+    # canonical spelling counts too ("sklearn" -> also "scikit-learn")
+    words = norm.split()
+    extra = [SKILL_CANONICAL[w] for w in words if w in SKILL_CANONICAL]
+    if norm in SKILL_CANONICAL:
+        extra.append(SKILL_CANONICAL[norm])
+
+    for part in [norm] + [_normalize(e) for e in extra]:
+        for word in part.split():
+            padded = f" {word} "
+            for n in NGRAMS:
+                for i in range(len(padded) - n + 1):
+                    idx, sign = _slot(padded[i:i + n], dim)
+                    vec[idx] += sign
+            idx, sign = _slot("w:" + word, dim)
+            vec[idx] += 2 * sign
+
+    length = float(np.linalg.norm(vec))
+    if length:
+        vec /= length
+    return vec
+
+
+def embed_many(texts: Sequence[str], dim: int = DIM) -> np.ndarray:
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, t in enumerate(texts):
+        out[i] = embed(t, dim)
+    return out
+
+
+# -----------------------------
+# Memory-mapped IVF index
+# -----------------------------
+# On-disk layout (one directory):
+#   meta.json        dim, count, nlist
+#   centroids.npy    (nlist, dim) float32
+#   offsets.npy      (nlist + 1,) int64   bucket i = rows offsets[i]:offsets[i+1]
+#   vectors.npy      (count, dim) float16, rows grouped by bucket
+#   labels.bin       utf-8 labels, concatenated in row order
+#   label_offsets.npy (count + 1,) int64
+def _kmeans(sample: np.ndarray, nlist: int, iters: int = 8, seed: int = 0) -> np.ndarray:
+    """Spherical k-means (cosine) on a sample of unit vectors."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iters):
+        assign = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-9)
+    return centroids.astype(np.float32)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk], dtype=np.float32)
+        out[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+class IndexBuilder:
+    """
+    Streaming builder: add() chunks of (labels, vectors), then finish().
+    Vectors and labels are spooled to disk, so memory stays flat for 1M+ rows.
+    """
+
+    def __init__(self, path: str, dim: int = DIM):
+        self.path = path
+        self.dim = dim
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+        self._raw_path = os.path.join(path, "vectors.raw")
+        self._raw = open(self._raw_path, "wb")
+        # labels: utf-8 bytes in insertion order + the end offset of each one
+        self._labels_path = os.path.join(path, "labels.raw")
+        self._label_ends_path = os.path.join(path, "label_ends.raw")
+        self._labels = open(self._labels_path, "wb")
+        self._label_ends = open(self._label_ends_path, "wb")
+        self._label_pos = 0
+
+    def add(self, labels: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if vectors.shape != (len(labels), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(labels)}, {self.dim}), got {vectors.shape}")
+        self._raw.write(vectors.tobytes())
+
+        ends = np.empty(len(labels), dtype=np.int64)
+        for i, label in enumerate(labels):
+            data = label.encode("utf-8")
+            self._labels.write(data)
+            self._label_pos += len(data)
+            ends[i] = self._label_pos
+        self._label_ends.write(ends.tobytes())
+        self.count += len(labels)
+
+    def finish(self, nlist: Optional[int] = None, sample_size: int = 50000) -> "VectorIndex":
+        self._raw.close()
+        self._labels.close()
+        self._label_ends.close()
+        if self.count == 0:
+            raise ValueError("No vectors added.")
+
+        raw = np.memmap(self._raw_path, dtype=np.float16, mode="r", shape=(self.count, self.dim))
+        nlist = nlist or max(1, min(4096, int(np.sqrt(self.count))))
+        nlist = min(nlist, self.count)
+
+        rng = np.random.default_rng(0)
+        pick = np.sort(rng.choice(self.count, size=min(self.count, max(sample_size, nlist)), replace=False))
+        centroids = _kmeans(np.asarray(raw[pick], dtype=np.float32), nlist)
+
+        assign = _assign(raw, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        vectors = np.lib.format.open_memmap(
+            os.path.join(self.path, "vectors.npy"), mode="w+", dtype=np.float16, shape=(self.count, self.dim)
+        )
+        chunk = 65536
+        for start in range(0, self.count, chunk):
+            vectors[start:start + chunk] = raw[order[start:start + chunk]]
+        vectors.flush()
+        del vectors, raw
+        os.remove(self._raw_path)
+
+        # reorder the spooled labels into bucket order, streaming
+        ends = np.memmap(self._label_ends_path, dtype=np.int64, mode="r", shape=(self.count,))
+        raw_labels = np.memmap(self._labels_path, dtype=np.uint8, mode="r") \
+            if self._label_pos > 0 else np.zeros(0, dtype=np.uint8)
+        label_offsets = np.lib.format.open_memmap(
+            os.path.join(self.path, "label_offsets.npy"), mode="w+", dtype=np.int64, shape=(self.count + 1,)
+        )
+        label_offsets[0] = 0
+        with open(os.path.join(self.path, "labels.bin"), "wb") as f:
+            pos = 0
+            for row, src in enumerate(order):
+                start, end = (int(ends[src - 1]) if src else 0), int(ends[src])
+                f.write(raw_labels[start:end].tobytes())
+                pos += end - start
+                label_offsets[row + 1] = pos
+        label_offsets.flush()
+        del label_offsets, ends, raw_labels
+        os.remove(self._labels_path)
+        os.remove(self._label_ends_path)
+
+        np.save(os.path.join(self.path, "centroids.npy"), centroids)
+        np.save(os.path.join(self.path, "offsets.npy"), offsets)
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "count": self.count, "nlist": nlist}, f)
+
+        return VectorIndex(self.path)
+
+
+class VectorIndex:
+    """Read-only, memory-mapped IVF index (see IndexBuilder)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.dim = int(meta["dim"])
+        self.count = int(meta["count"])
+        self.centroids = np.load(os.path.join(path, "centroids.npy"))
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.label_offsets = np.load(os.path.join(path, "label_offsets.npy"), mmap_mode="r")
+        self.labels = np.memmap(os.path.join(path, "labels.bin"), dtype=np.uint8, mode="r") \
+            if self.label_offsets[-1] > 0 else np.zeros(0, dtype=np.uint8)
+
+    def label(self, row: int) -> str:
+        start, end = int(self.label_offsets[row]), int(self.label_offsets[row + 1])
+        return bytes(self.labels[start:end]).decode("utf-8")
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = 8) -> List[Tuple[str, float]]:
+        query = np.asarray(query, dtype=np.float32)
+        if not query.any():
+            return []
+
+        nprobe = min(nprobe, len(self.centroids))
+        buckets = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+
+        rows: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+        for b in buckets:
+            start, end = int(self.offsets[b]), int(self.offsets[b + 1])
+            if start == end:
+                continue
+            block = np.asarray(self.vectors[start:end], dtype=np.float32)
+            rows.append(np.arange(start, end))
+            scores.append(block @ query)
+        if not rows:
+            return []
+
+        all_rows = np.concatenate(rows)
+        all_scores = np.concatenate(scores)
+        k = min(k, len(all_rows))
+        top = np.argpartition(-all_scores, k - 1)[:k]
+        top = top[np.argsort(-all_scores[top])]
+        return [(self.label(int(all_rows[i])), round(float(all_scores[i]), 4)) for i in top]
+
+
+# -----------------------------
+# Skills / jobs helpers
+# -----------------------------
+def skill_vocabulary(extra: Iterable[str] = ()) -> List[str]:
+    # canonical names only: the lowercase alias keys ("sklearn", "postgres")
+    # already reach their canonical entry through embed()
+    seen: Dict[str, str] = {}
+    for s in list(SKILL_CANONICAL.values()) + list(extra):
+        s = s.strip()
+        if s and s.lower() not in seen:
+            seen[s.lower()] = s
+    return sorted(seen.values(), key=str.lower)
+
+
+def build_skill_index(path: str, extra: Iterable[str] = ()) -> VectorIndex:
+    vocab = skill_vocabulary(extra)
+    builder = IndexBuilder(path)
+    builder.add(vocab, embed_many(vocab))
+    return builder.finish()
+
+
+def job_text(job: Dict) -> str:
+    skills = job.get("requiredSkills") or job.get("skills") or []
+    parts = [job.get("role", ""), job.get("title", ""), " ".join(skills), job.get("description", "")]
+    return " ".join(p for p in parts if p)
+
+
+def profile_text(profile: Dict) -> str:
+    """Text used to match a parsed profile (extract_profile output) against jobs."""
+    edu = profile.get("education") or {}
+    roles = [x.get("role", "") for x in profile.get("experience_details") or []]
+    parts = list(profile.get("skills") or []) + [edu.get("branch_or_major", "")] + roles
+    return " ".join(p for p in parts if p)
+
+
+def _read_jobs(jsonl_path: str) -> Iterator[Dict]:
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_job_index(path: str, jobs: Iterable[Dict], chunk: int = 10000) -> VectorIndex:
+    """Label of each row is the job JSON (so results are self-contained)."""
+    builder = IndexBuilder(path)
+    batch: List[Dict] = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= chunk:
+            builder.add([json.dumps(j, ensure_ascii=False) for j in batch], embed_many([job_text(j) for j in batch]))
+            batch = []
+    if batch:
+        builder.add([json.dumps(j, ensure_ascii=False) for j in batch], embed_many([job_text(j) for j in batch]))
+    return builder.finish()
+
+
+def similar_skills(index: VectorIndex, skill: str, k: int = 10) -> List[Tuple[str, float]]:
+    # indexes built before skill_vocabulary dropped the aliases still hold them,
+    # so map every hit to its canonical name and keep the best score of each
+    low = skill.strip().lower()
+    seen = {low, SKILL_CANONICAL.get(low, skill).lower()}
+    out: List[Tuple[str, float]] = []
+    for s, score in index.search(embed(skill), k=2 * k + 2):
+        s = SKILL_CANONICAL.get(s.lower(), s)
+        if s.lower() not in seen:
+            seen.add(s.lower())
+            out.append((s, score))
+    return out[:k]
+
+
+def similar_jobs(index: VectorIndex, profile: Dict, k: int = 10) -> List[Tuple[Dict, float]]:
+    return [(json.loads(label), score) for label, score in index.search(embed(profile_text(profile)), k=k)]
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _bench(n: int, path: str, queries: int = 200) -> None:
+    rng = np.random.default_rng(1)
+    t0 = time.perf_counter()
+    builder = IndexBuilder(path)
+    chunk = 100000
+    for start in range(0, n, chunk):
+        m = min(chunk, n - start)
+        block = rng.standard_normal((m, DIM)).astype(np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        builder.add([f"v{start + i}" for i in range(m)], block)
+    index = builder.finish()
+    print(f"built {n} vectors in {time.perf_counter() - t0:.1f}s")
+
+    index = VectorIndex(path)
+    qs = rng.standard_normal((queries, DIM)).astype(np.float32)
+    t0 = time.perf_counter()
+    for q in qs:
+        index.search(q / np.linalg.norm(q), k=10)
+    print(f"avg query: {(time.perf_counter() - t0) / queries * 1000:.2f} ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Offline semantic skill/job matching.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("build-skills")
+    p.add_argument("out")
+    p.add_argument("--extra", help="text file with one extra skill per line")
+
+    p = sub.add_parser("build-jobs")
+    p.add_argument("out")
+    p.add_argument("jobs", help="JSONL, one job per line (role, requiredSkills, description, ...)")
+
+    p = sub.add_parser("similar-skills")
+    p.add_argument("index")
+    p.add_argument("skill")
+    p.add_argument("-k", type=int, default=10)
+
+    p = sub.add_parser("similar-jobs")
+    p.add_argument("index")
+    p.add_argument("profile", help="extract_profile JSON output")
+    p.add_argument("-k", type=int, default=10)
+
+    p = sub.add_parser("bench")
+    p.add_argument("--n", type=int, default=1000000)
+    p.add_argument("--path", default="indexes/bench")
+
+    args = ap.parse_args()
+
+    if args.cmd == "build-skills":
+        extra: List[str] = []
+        if args.extra:
+            with open(args.extra, encoding="utf-8") as f:
+                extra = [ln.strip() for ln in f if ln.strip()]
+        index = build_skill_index(args.out, extra)
+        print(f"✅ {index.count} skills -> {args.out}")
+    elif args.cmd == "build-jobs":
+        index = build_job_index(args.out, _read_jobs(args.jobs))
+        print(f"✅ {index.count} jobs -> {args.out}")
+    elif args.cmd == "similar-skills":
+        for skill, score in similar_skills(VectorIndex(args.index), args.skill, args.k):
+            print(f"{score:.3f}  {skill}")
+    elif args.cmd == "similar-jobs":
+        with open(args.profile, encoding="utf-8") as f:
+            profile = json.load(f)
+        for job, score in similar_jobs(VectorIndex(args.index), profile, args.k):
+            print(f"{score:.3f}  {job.get('role', '')} @ {job.get('company', '')}")
+    elif args.cmd == "bench":
+        _bench(args.n, args.path)
+
+
+if __name__ == "__main__":
+    main()
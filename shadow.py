@@ -0,0 +1,209 @@
+"""
+Shadow mode: run a candidate version of resume_nlp next to the live one.
+
+A sampled fraction of parse requests is queued (after the response has been
+sent) to a background thread, which hands the text to a single separate
+process. That process runs the live resume_nlp.extract_profile and the
+candidate's extract_profile back to back, so both latencies are measured
+under the same conditions, and returns per-field differences. One JSON line
+per sample is appended to the shadow log; summarize it with
+shadow_report.py.
+
+The candidate is any file exposing extract_profile(text, budget=None), e.g.
+a copy of resume_nlp.py with new clean_skill or QUAL_RANKS rules. Resume
+text is never written to the log, only a hash of it.
+
+When the queue is full (candidate slower than the sampled traffic) samples
+are dropped and counted instead of waiting. A sample that takes longer than
+the timeout (a candidate stuck in a loop) is logged as a timeout, and the
+shadow process is killed and replaced.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# derived from the other fields, so a diff there is always a duplicate
+IGNORED_FIELDS = {"profile_text"}
+
+CANDIDATE_MODULE = "resume_nlp_candidate"
+
+_candidate = None
+
+
+def load_candidate(path: str):
+    """Imports a parser file under its own module name (never as resume_nlp)."""
+    spec = importlib.util.spec_from_file_location(CANDIDATE_MODULE, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load candidate parser from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[CANDIDATE_MODULE] = module
+    spec.loader.exec_module(module)
+    if not callable(getattr(module, "extract_profile", None)):
+        raise ImportError(f"{path} has no extract_profile()")
+    return module
+
+
+# -----------------------------
+# Diffs
+# -----------------------------
+def _flatten(profile: Dict, prefix: str = "") -> Dict[str, object]:
+    out = {}
+    for key, value in profile.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(_flatten(value, path + "."))
+        else:
+            out[path] = value
+    return out
+
+
+def diff_profiles(primary: Dict, candidate: Dict) -> Dict[str, Dict]:
+    """
+    {field path: change} for every field that differs. String lists (skills,
+    warnings) report added/removed items; anything else both values.
+    """
+    a, b = _flatten(primary), _flatten(candidate)
+    diff = {}
+    for path in sorted(set(a) | set(b)):
+        if path in IGNORED_FIELDS:
+            continue
+        va, vb = a.get(path), b.get(path)
+        if va == vb:
+            continue
+        if isinstance(va, list) and isinstance(vb, list) and all(isinstance(x, str) for x in va + vb):
+            added, removed = sorted(set(vb) - set(va)), sorted(set(va) - set(vb))
+            diff[path] = {"added": added, "removed": removed} if added or removed else {"reordered": True}
+        else:
+            diff[path] = {"primary": va, "candidate": vb}
+    return diff
+
+
+# -----------------------------
+# Shadow process
+# -----------------------------
+def _init_worker(candidate_path: str) -> None:
+    global _candidate
+    import resume_nlp  # noqa: F401  (warm the live parser too)
+    _candidate = load_candidate(candidate_path)
+
+
+def _run_both(text: str, budget: Optional[Dict[str, int]]) -> Dict:
+    import resume_nlp
+
+    t0 = time.perf_counter()
+    primary = resume_nlp.extract_profile(text, budget=budget)
+    primary_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    try:
+        candidate = _candidate.extract_profile(text, budget=budget)
+    except Exception as e:
+        return {"primary_ms": round(primary_ms, 3), "error": f"{type(e).__name__}: {e}"}
+    candidate_ms = (time.perf_counter() - t0) * 1000
+
+    return {
+        "primary_ms": round(primary_ms, 3),
+        "candidate_ms": round(candidate_ms, 3),
+        "diff": diff_profiles(primary, candidate),
+    }
+
+
+class ShadowRunner:
+    def __init__(
+        self,
+        candidate_path: str,
+        log_path: str,
+        sample_rate: float = 0.05,
+        max_pending: int = 32,
+        timeout: float = 30.0,
+    ):
+        if not os.path.isfile(candidate_path):
+            raise FileNotFoundError(f"Candidate parser not found: {candidate_path}")
+
+        self.candidate_path = candidate_path
+        self.log_path = log_path
+        self.sample_rate = sample_rate
+        self.timeout = timeout
+        self.sampled = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._pool = self._new_pool()
+        self._thread = threading.Thread(target=self._loop, name="shadow-parser", daemon=True)
+        self._thread.start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(self.candidate_path,))
+
+    def _replace_pool(self) -> None:
+        """
+        shutdown() alone leaves a stuck candidate running in its worker; kill
+        the worker so the next sample gets a fresh process.
+        """
+        processes = list((getattr(self._pool, "_processes", None) or {}).values())
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        self._pool = self._new_pool()
+
+    def submit(self, text: str, budget: Optional[Dict[str, int]] = None) -> bool:
+        """Never blocks; returns True if the text was sampled and queued."""
+        if random.random() >= self.sample_rate:
+            return False
+        try:
+            self._queue.put_nowait((text, budget))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.sampled += 1
+        return True
+
+    def _loop(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            text, budget = item
+
+            try:
+                record = self._pool.submit(_run_both, text, budget).result(timeout=self.timeout)
+            except TimeoutError:
+                record = {"error": f"Candidate timed out after {self.timeout:g}s."}
+                self._replace_pool()
+            except BrokenProcessPool:
+                # the candidate crashed the process (or failed to import)
+                record = {"error": "Shadow process died (crash or candidate import error)."}
+                self._replace_pool()
+            except Exception as e:
+                record = {"error": f"{type(e).__name__}: {e}"}
+
+            record = {
+                "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "text_sha": hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+                "chars": len(text),
+                **record,
+            }
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self, timeout: float = 5.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._pool.shutdown(wait=False, cancel_futures=True)
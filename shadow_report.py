@@ -0,0 +1,110 @@
+"""
+Summarize a shadow log written by shadow.py.
+
+  python shadow_report.py logs/shadow.jsonl
+  python shadow_report.py logs/shadow.jsonl --since 2026-10-01 --top 15
+"""
+import argparse
+import json
+from collections import Counter
+from typing import Dict, List
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def load(path: str, since: str = "") -> List[Dict]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line while the server is writing
+            if since and rec.get("ts", "") < since:
+                continue
+            records.append(rec)
+    return records
+
+
+def summarize(records: List[Dict], top: int = 10) -> Dict:
+    ok = [r for r in records if "error" not in r]
+    primary = [r["primary_ms"] for r in ok]
+    candidate = [r["candidate_ms"] for r in ok]
+    deltas = [r["candidate_ms"] - r["primary_ms"] for r in ok]
+
+    field_counts = Counter()
+    added, removed = Counter(), Counter()
+    examples: Dict[str, Dict] = {}
+    for r in ok:
+        for path, change in r["diff"].items():
+            field_counts[path] += 1
+            added.update(f"{path}: {v}" for v in change.get("added", []))
+            removed.update(f"{path}: {v}" for v in change.get("removed", []))
+            examples.setdefault(path, change)
+
+    latency = {}
+    for label, values in (("primary", primary), ("candidate", candidate), ("delta", deltas)):
+        latency[label] = {p: _percentile(values, p) for p in (50, 95, 99)}
+
+    return {
+        "samples": len(records),
+        "errors": len(records) - len(ok),
+        "error_examples": Counter(r["error"] for r in records if "error" in r).most_common(3),
+        "identical": sum(1 for r in ok if not r["diff"]),
+        "latency_ms": latency,
+        "fields": [(path, n, n / len(ok), examples[path]) for path, n in field_counts.most_common()],
+        "top_added": added.most_common(top),
+        "top_removed": removed.most_common(top),
+    }
+
+
+def print_report(s: Dict) -> None:
+    compared = s["samples"] - s["errors"]
+    print(f"samples: {s['samples']}   candidate errors: {s['errors']}   "
+          f"identical profiles: {s['identical']}/{compared}")
+    for err, n in s["error_examples"]:
+        print(f"  x{n} {err}")
+
+    print("\nlatency (ms)        p50       p95       p99")
+    for label, row in s["latency_ms"].items():
+        sign = "+" if label == "delta" else " "
+        print(f"  {label:<10}" + "".join(f"{row[p]:>{sign}10.2f}" for p in (50, 95, 99)))
+
+    print("\nfields that differ (share of compared samples)")
+    if not s["fields"]:
+        print("  none")
+    for path, n, share, example in s["fields"]:
+        print(f"  {path:<40} {share:7.1%}  ({n})  e.g. {json.dumps(example, ensure_ascii=False)[:80]}")
+
+    for title, rows in (("added by candidate", s["top_added"]), ("removed by candidate", s["top_removed"])):
+        if rows:
+            print(f"\nmost often {title}")
+            for value, n in rows:
+                print(f"  {n:>6}  {value}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Summarize shadow-mode parser comparisons.")
+    ap.add_argument("log", help="shadow JSONL log (DEET_SHADOW_LOG)")
+    ap.add_argument("--since", default="", help="only samples at or after this ISO timestamp/date")
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    records = load(args.log, args.since)
+    if not records:
+        print("no samples")
+        return
+    print_report(summarize(records, args.top))
+
+
+if __name__ == "__main__":
+    main()
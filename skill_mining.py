@@ -0,0 +1,385 @@
+"""
+Skill-taxonomy mining over large resume corpora.
+
+Runs extract_skills with a trace over every resume and aggregates the raw
+skills-section tokens in one streaming pass with bounded memory:
+
+  - a count-min sketch for approximate token counts (fixed size)
+  - a heavy-hitters table that keeps only the most frequent candidates
+  - exact counters for the handful of clean_skill rejection rules
+
+Input shards are processed in parallel and the partial summaries merged.
+The report is approximate: the sketches merge exactly, but each shard's
+heavy-hitters table is pruned to its own top candidates first, so which
+tokens near the cut-off make the report can depend on how the corpus was
+split. Frequent tokens are not affected. The report lists
+the most frequent tokens SKILL_CANONICAL does not map, groups spelling
+variants of the same skill ("Power BI", "PowerBI", "power-bi") into alias
+clusters with a suggested canonical entry, and shows how often each
+rejection rule fired (with examples) for tuning clean_skill.
+
+  python skill_mining.py samples/
+  python skill_mining.py corpus/shard-*.jsonl --workers 8 --top 50 --json report.json
+
+Inputs: .txt files (one resume each), .jsonl files (one {"text": ...} per
+line) or directories containing either.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import re
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import resume_nlp
+
+try:
+    import semantic_index  # needs numpy; only used for alias suggestions
+except ImportError:
+    semantic_index = None
+
+TXT_FILES_PER_SHARD = 200
+# semantic similarity to a canonical skill: >= ALIAS is reported as an alias,
+# >= SIMILAR as a new skill that is worth a look next to the similar one
+ALIAS_MIN_SCORE = 0.9
+SIMILAR_MIN_SCORE = 0.5
+
+
+# -----------------------------
+# Sketches
+# -----------------------------
+class CountMinSketch:
+    """Approximate counts; never under-counts, over-counts by <= ~e/width of the total."""
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = array("q", bytes(8 * width * depth))
+        self.total = 0
+
+    def _slots(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for row in range(self.depth):
+            yield row * self.width + (h1 + row * h2) % self.width
+
+    def add(self, key: str, n: int = 1) -> None:
+        for slot in self._slots(key):
+            self.table[slot] += n
+        self.total += n
+
+    def estimate(self, key: str) -> int:
+        return min(self.table[slot] for slot in self._slots(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge count-min sketches of different sizes")
+        table = self.table
+        for i, v in enumerate(other.table):
+            if v:
+                table[i] += v
+        self.total += other.total
+
+
+class HeavyHitters:
+    """
+    Candidate set for the most frequent keys. Grows to 2 x capacity, then is
+    cut back to the top `capacity`; reported counts come from the sketch.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.counts[key] = self.counts.get(key, 0) + n
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self) -> None:
+        self.counts = dict(heapq.nlargest(self.capacity, self.counts.items(), key=lambda kv: kv[1]))
+
+    def merge(self, other: "HeavyHitters") -> None:
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def keys(self) -> List[str]:
+        return list(self.counts)
+
+
+# -----------------------------
+# Mergeable corpus summary
+# -----------------------------
+class SkillStats:
+    def __init__(self, capacity: int = 2000, width: int = 1 << 16, depth: int = 4):
+        self.resumes = 0
+        self.with_skills_section = 0
+        self.tokens = 0
+        self.accepted = 0
+        self.mapped = 0
+        self.rule_hits: Counter = Counter()
+        self.sketch = CountMinSketch(width, depth)
+        self.unmapped = HeavyHitters(capacity)
+        self.rejected: Dict[str, HeavyHitters] = defaultdict(lambda: HeavyHitters(50))
+
+    def add_resume(self, trace: List[Dict], has_section: bool) -> None:
+        self.resumes += 1
+        self.with_skills_section += has_section
+        for item in trace:
+            token = item["token"]
+            if not token:  # split artifacts (",,", blank lines)
+                continue
+            self.tokens += 1
+            rule = item["rule"]
+            if rule is not None:
+                self.rule_hits[rule] += 1
+                self.sketch.add(f"r:{rule}:{token}")
+                self.rejected[rule].add(token)
+            elif item["canonical"] is not None:
+                self.accepted += 1
+                self.mapped += 1
+            else:
+                self.accepted += 1
+                self.sketch.add(f"u:{token}")
+                self.unmapped.add(token)
+
+    def merge(self, other: "SkillStats") -> None:
+        self.resumes += other.resumes
+        self.with_skills_section += other.with_skills_section
+        self.tokens += other.tokens
+        self.accepted += other.accepted
+        self.mapped += other.mapped
+        self.rule_hits.update(other.rule_hits)
+        self.sketch.merge(other.sketch)
+        self.unmapped.merge(other.unmapped)
+        for rule, hh in other.rejected.items():
+            self.rejected[rule].merge(hh)
+
+    def __getstate__(self):
+        # the defaultdict factory is a lambda, which does not pickle
+        state = dict(self.__dict__)
+        state["rejected"] = dict(self.rejected)
+        return state
+
+    def __setstate__(self, state):
+        rejected = state.pop("rejected")
+        self.__dict__.update(state)
+        self.rejected = defaultdict(lambda: HeavyHitters(50), rejected)
+
+    def top_unmapped(self, n: int) -> List[Tuple[str, int]]:
+        scored = [(token, self.sketch.estimate(f"u:{token}")) for token in self.unmapped.keys()]
+        return heapq.nlargest(n, scored, key=lambda kv: kv[1])
+
+    def top_rejected(self, rule: str, n: int) -> List[Tuple[str, int]]:
+        hh = self.rejected.get(rule)
+        if hh is None:
+            return []
+        scored = [(token, self.sketch.estimate(f"r:{rule}:{token}")) for token in hh.keys()]
+        return heapq.nlargest(n, scored, key=lambda kv: kv[1])
+
+
+# -----------------------------
+# Alias clusters
+# -----------------------------
+def _skeleton(token: str) -> str:
+    """Spelling-insensitive key: "Power BI", "PowerBI" and "power-bi" agree."""
+    return re.sub(r"[^a-z0-9+#]", "", token.lower())
+
+
+def _canonical_matcher():
+    """(skeleton -> canonical, semantic nearest-canonical function or None)."""
+    by_skeleton = {}
+    for key, canon in resume_nlp.SKILL_CANONICAL.items():
+        by_skeleton.setdefault(_skeleton(key), canon)
+        by_skeleton.setdefault(_skeleton(canon), canon)
+
+    if semantic_index is None:
+        return by_skeleton, None
+
+    names = sorted(set(resume_nlp.SKILL_CANONICAL.values()))
+    matrix = semantic_index.embed_many(names)
+
+    def nearest(token: str) -> Tuple[str, float]:
+        scores = matrix @ semantic_index.embed(token)
+        best = int(scores.argmax())
+        return names[best], float(scores[best])
+
+    return by_skeleton, nearest
+
+
+def alias_clusters(top: List[Tuple[str, int]]) -> List[Dict]:
+    """
+    Groups unmapped tokens by skeleton. Each cluster suggests either an
+    existing canonical skill to alias to, or a new SKILL_CANONICAL entry
+    named after its most frequent spelling.
+    """
+    groups: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+    for token, count in top:
+        groups[_skeleton(token)].append((token, count))
+
+    by_skeleton, nearest = _canonical_matcher()
+    clusters = []
+    for skeleton, variants in groups.items():
+        variants.sort(key=lambda kv: -kv[1])
+        suggestion = {"new_skill": variants[0][0]}
+        if skeleton in by_skeleton:
+            suggestion = {"alias_of": by_skeleton[skeleton], "score": 1.0}
+        elif nearest is not None:
+            canon, score = nearest(variants[0][0])
+            if score >= ALIAS_MIN_SCORE:
+                suggestion = {"alias_of": canon, "score": round(score, 3)}
+            elif score >= SIMILAR_MIN_SCORE:
+                suggestion["similar_to"] = canon
+                suggestion["score"] = round(score, 3)
+        clusters.append({
+            "count": sum(c for _, c in variants),
+            "variants": [{"token": t, "count": c} for t, c in variants],
+            "keys": sorted({t.lower() for t, _ in variants}),
+            **suggestion,
+        })
+    clusters.sort(key=lambda c: -c["count"])
+    return clusters
+
+
+# -----------------------------
+# Input shards (worker processes)
+# -----------------------------
+def _iter_texts(shard: Tuple[str, List[str]]) -> Iterator[str]:
+    kind, paths = shard
+    for path in paths:
+        if kind == "jsonl":
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    text = record.get("text") or record.get("raw_text") or ""
+                    if text:
+                        yield text
+        else:
+            yield Path(path).read_text(encoding="utf-8", errors="ignore")
+
+
+def mine_shard(shard: Tuple[str, List[str]], capacity: int = 2000) -> SkillStats:
+    stats = SkillStats(capacity)
+    for raw in _iter_texts(shard):
+        text, sections, _ = resume_nlp.prepare_text(raw, resume_nlp.DEFAULT_BUDGET)
+        trace: List[Dict] = []
+        resume_nlp.extract_skills(text, sections, trace=trace)
+        stats.add_resume(trace, bool(sections.get("skills")))
+    return stats
+
+
+def make_shards(inputs: Iterable[str]) -> List[Tuple[str, List[str]]]:
+    txt, jsonl = [], []
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            txt.extend(str(f) for f in sorted(p.rglob("*.txt")))
+            jsonl.extend(str(f) for f in sorted(p.rglob("*.jsonl")))
+        elif p.suffix == ".jsonl":
+            jsonl.append(str(p))
+        elif p.suffix == ".txt":
+            txt.append(str(p))
+
+    shards = [("jsonl", [f]) for f in jsonl]
+    shards += [("txt", txt[i:i + TXT_FILES_PER_SHARD]) for i in range(0, len(txt), TXT_FILES_PER_SHARD)]
+    return shards
+
+
+def mine(inputs: Iterable[str], workers: Optional[int] = None, capacity: int = 2000) -> SkillStats:
+    shards = make_shards(inputs)
+    total = SkillStats(capacity)
+    if not shards:
+        return total
+
+    workers = min(workers or os.cpu_count() or 2, len(shards))
+    if workers <= 1:
+        for shard in shards:
+            total.merge(mine_shard(shard, capacity))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for fut in as_completed([pool.submit(mine_shard, shard, capacity) for shard in shards]):
+            total.merge(fut.result())
+    return total
+
+
+# -----------------------------
+# Report
+# -----------------------------
+def build_report(stats: SkillStats, top: int = 30) -> Dict:
+    unmapped = stats.top_unmapped(top * 3)  # extra candidates so clusters can fill up
+    return {
+        "resumes": stats.resumes,
+        "with_skills_section": stats.with_skills_section,
+        "tokens": stats.tokens,
+        "accepted": stats.accepted,
+        "mapped": stats.mapped,
+        "top_unmapped": [{"token": t, "count": c} for t, c in unmapped[:top]],
+        "alias_clusters": alias_clusters(unmapped)[:top],
+        "rule_hits": [
+            {"rule": rule, "hits": n, "examples": [t for t, _ in stats.top_rejected(rule, 5)]}
+            for rule, n in stats.rule_hits.most_common()
+        ],
+    }
+
+
+def print_report(report: Dict) -> None:
+    tokens = report["tokens"] or 1
+    print(f"resumes: {report['resumes']}  (with a skills section: {report['with_skills_section']})")
+    print(f"skill tokens: {report['tokens']}  accepted: {report['accepted']} "
+          f"({report['accepted'] / tokens:.0%})  mapped to SKILL_CANONICAL: {report['mapped']}")
+
+    print("\ntop unmapped tokens (accepted, not in SKILL_CANONICAL)")
+    for row in report["top_unmapped"]:
+        print(f"  {row['count']:>8}  {row['token']}")
+
+    print("\nalias clusters")
+    for c in report["alias_clusters"]:
+        spellings = ", ".join(f"{v['token']} ({v['count']})" for v in c["variants"])
+        if "alias_of" in c:
+            hint = f"-> alias of {c['alias_of']} (score {c['score']})"
+        elif "similar_to" in c:
+            hint = f"-> new skill \"{c['new_skill']}\"? (similar to {c['similar_to']}, score {c['score']})"
+        else:
+            hint = f"-> new skill \"{c['new_skill']}\""
+        print(f"  {c['count']:>8}  {spellings}  {hint}")
+
+    print("\nclean_skill rejection rules")
+    for row in report["rule_hits"]:
+        print(f"  {row['hits']:>8}  {row['rule']:<18} e.g. {', '.join(row['examples'])[:90]}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Mine skill tokens for SKILL_CANONICAL / clean_skill tuning.")
+    ap.add_argument("inputs", nargs="+", help=".txt / .jsonl files or directories")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--top", type=int, default=30)
+    ap.add_argument("--capacity", type=int, default=2000, help="heavy-hitter candidates kept per shard")
+    ap.add_argument("--json", help="also write the report as JSON here")
+    args = ap.parse_args()
+
+    report = build_report(mine(args.inputs, args.workers, args.capacity), args.top)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
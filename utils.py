@@ -6,32 +6,87 @@ from docx import Document  # For DOCX text extraction
 from PIL import Image  # For image handling
 import pytesseract  # For OCR on images
 
+from docx_stream import read_docx_text  # Streaming DOCX reader (tables, headers, text boxes)
+
+
+class ExtractionError(Exception):
+    """Raised by extract_text_or_raise with a human readable reason."""
+
+
+# The _read_* helpers raise on failure; the public extract_* wrappers keep
+# the old "return '' on any error" behaviour.
+def _read_pdf_text(file_path: str) -> str:
+    text_chunks = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            if page_text.strip():
+                text_chunks.append(page_text)
+
+    return "\n".join(text_chunks)
+
+
+def _read_docx_text(file_path: str) -> str:
+    try:
+        return read_docx_text(file_path)
+    except Exception:
+        # unusual packaging the streaming reader does not handle; python-docx
+        # reads body paragraphs only, and raises the real error if it is broken
+        pass
+
+    document = Document(file_path)
+    paragraphs = [para.text for para in document.paragraphs if para.text]
+    return "\n".join(paragraphs)
+
+
+def _read_image_text(file_path: str) -> str:
+    image = Image.open(file_path)
+    text = pytesseract.image_to_string(image)
+    return text or ""
+
+
+def _read_txt_text(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        raw = f.read()
+
+    # common encodings in Windows + BOM support
+    for enc in ("utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "cp1252", "latin-1"):
+        try:
+            text = raw.decode(enc)
+            if text and text.strip():
+                return text
+        except Exception:
+            continue
+
+    return raw.decode("utf-8", errors="ignore")
+
+
+_READERS = {
+    "txt": _read_txt_text,
+    "pdf": _read_pdf_text,
+    "docx": _read_docx_text,
+    "png": _read_image_text,
+    "jpg": _read_image_text,
+    "jpeg": _read_image_text,
+}
+
 
 def extract_pdf_text(file_path: str) -> str:
     if not os.path.exists(file_path):
         return ""
 
-    text_chunks = []
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                if page_text.strip():
-                    text_chunks.append(page_text)
+        return _read_pdf_text(file_path)
     except Exception:
         return ""
 
-    return "\n".join(text_chunks)
-
 
 def extract_docx_text(file_path: str) -> str:
     if not os.path.exists(file_path):
         return ""
 
     try:
-        document = Document(file_path)
-        paragraphs = [para.text for para in document.paragraphs if para.text]
-        return "\n".join(paragraphs)
+        return _read_docx_text(file_path)
     except Exception:
         return ""
 
@@ -41,9 +96,7 @@ def extract_image_text(file_path: str) -> str:
         return ""
 
     try:
-        image = Image.open(file_path)
-        text = pytesseract.image_to_string(image)
-        return text or ""
+        return _read_image_text(file_path)
     except Exception:
         return ""
 
@@ -56,19 +109,7 @@ def extract_txt_text(file_path: str) -> str:
         return ""
 
     try:
-        with open(file_path, "rb") as f:
-            raw = f.read()
-
-        # common encodings in Windows + BOM support
-        for enc in ("utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "cp1252", "latin-1"):
-            try:
-                text = raw.decode(enc)
-                if text and text.strip():
-                    return text
-            except Exception:
-                continue
-
-        return raw.decode("utf-8", errors="ignore")
+        return _read_txt_text(file_path)
     except Exception:
         return ""
 
@@ -121,4 +162,23 @@ def extract_text(file_path: str, extension: str) -> str:
     if ext in {"png", "jpg", "jpeg"}:
         return extract_image_text(file_path)
 
-    return ""
\ No newline at end of file
+    return ""
+
+
+def extract_text_or_raise(file_path: str, extension: str) -> str:
+    """
+    Same as extract_text, but failures raise instead of returning "".
+    Raises ExtractionError for bad input, otherwise whatever the underlying
+    library raised (used by extract_pool to report failure reasons).
+    """
+    if not file_path or not extension:
+        raise ExtractionError("Missing file path or extension.")
+
+    ext = extension.lower().lstrip(".")
+    reader = _READERS.get(ext)
+    if reader is None:
+        raise ExtractionError(f"Unsupported file type: .{ext}")
+    if not os.path.exists(file_path):
+        raise ExtractionError("File not found.")
+
+    return reader(file_path)
\ No newline at end of file